@@ -0,0 +1,156 @@
+"""Análise de itens a partir do log de eventos de resposta.
+
+Para cada questão calcula dificuldade (proporção de acertos), índice de
+discriminação (grupo superior - grupo inferior, 27%), correlação ponto-bisserial
+com o escore do aluno sem a própria questão e estatísticas do distrator (a
+alternativa errada). Só a primeira tentativa de cada aluno em cada questão
+entra na conta, porque depois disso ele já viu a justificativa.
+
+Tudo é feito com operações colunares (pandas.factorize + numpy.bincount), sem
+laços em Python por linha.
+
+Uso:
+    python analise_itens.py [diretorio_eventos] [--saida itens.csv]
+"""
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from banco_perguntas import CAMINHO_BANCO, carregar_banco
+from eventos import DIRETORIO_PADRAO
+
+FRACAO_GRUPOS = 0.27
+COLUNAS = ["ts", "sessao", "id_pergunta", "chave_topico", "resposta", "correta"]
+
+
+def carregar_eventos(diretorio=DIRETORIO_PADRAO, aliases=None):
+    """Lê os segmentos de eventos; ``aliases`` (ver Banco.aliases) traz ids antigos para os atuais."""
+    arquivos = sorted(glob.glob(os.path.join(diretorio, "*.csv")))
+    if not arquivos:
+        return pd.DataFrame({c: pd.Series(dtype="object") for c in COLUNAS})
+    tipos = {"ts": "float64", "correta": "int8"}
+    eventos = pd.concat((pd.read_csv(a, usecols=COLUNAS, dtype=tipos) for a in arquivos),
+                        ignore_index=True)
+    if aliases:
+        eventos["id_pergunta"] = eventos["id_pergunta"].replace(aliases)
+    # Categorias só depois do concat: segmentos com categorias diferentes virariam object
+    for coluna in ("sessao", "id_pergunta", "chave_topico", "resposta"):
+        eventos[coluna] = eventos[coluna].astype("category")
+    return eventos
+
+
+def primeiras_tentativas(eventos):
+    # Os segmentos são append-only, então o log costuma já vir em ordem de tempo
+    # e a ordenação (a parte mais cara) pode ser pulada
+    if not eventos["ts"].is_monotonic_increasing:
+        eventos = eventos.sort_values("ts", kind="stable")
+    sessao = pd.factorize(eventos["sessao"])[0].astype(np.int64)
+    item, ids = pd.factorize(eventos["id_pergunta"])
+    chave = sessao * len(ids) + item
+    return eventos[~pd.Series(chave).duplicated().to_numpy()]
+
+
+def analisar(eventos):
+    """Devolve um DataFrame com uma linha por questão."""
+    df = primeiras_tentativas(eventos)
+    if df.empty:
+        return pd.DataFrame(columns=["id_pergunta", "chave_topico", "respostas", "dificuldade",
+                                     "discriminacao", "ponto_bisserial", "escolheu_v",
+                                     "distrator_inferior", "distrator_superior"])
+
+    item, ids = pd.factorize(df["id_pergunta"], sort=True)
+    aluno, _ = pd.factorize(df["sessao"])
+    c = df["correta"].to_numpy(dtype=np.float64)
+    escolheu_v = (df["resposta"].to_numpy() == "V").astype(np.float64)
+    n_itens = len(ids)
+
+    # Escore de cada aluno = proporção de acertos entre as questões que respondeu
+    n_aluno = np.bincount(aluno)
+    acertos_aluno = np.bincount(aluno, weights=c)
+    escore_aluno = acertos_aluno / n_aluno
+
+    # Escore "resto" de cada resposta: o aluno sem esta questão
+    n_resto = n_aluno[aluno] - 1
+    com_resto = n_resto > 0
+    resto = np.where(com_resto, (acertos_aluno[aluno] - c) / np.maximum(n_resto, 1), np.nan)
+
+    # Grupos superior e inferior pelo escore do aluno
+    limite_inferior, limite_superior = np.quantile(escore_aluno, [FRACAO_GRUPOS, 1 - FRACAO_GRUPOS])
+    inferior = escore_aluno[aluno] <= limite_inferior
+    superior = escore_aluno[aluno] >= limite_superior
+
+    def soma(pesos, mascara=None):
+        if mascara is not None:
+            return np.bincount(item[mascara], weights=pesos[mascara], minlength=n_itens)
+        return np.bincount(item, weights=pesos, minlength=n_itens)
+
+    um = np.ones_like(c)
+    n = soma(um)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dificuldade = soma(c) / n
+        discriminacao = soma(c, superior) / soma(um, superior) - soma(c, inferior) / soma(um, inferior)
+
+        # Ponto-bisserial = Pearson entre acerto (0/1) e escore resto, por questão
+        x, y = c[com_resto], resto[com_resto]
+        k = np.bincount(item[com_resto], minlength=n_itens)
+        sx = np.bincount(item[com_resto], weights=x, minlength=n_itens)
+        sy = np.bincount(item[com_resto], weights=y, minlength=n_itens)
+        sxy = np.bincount(item[com_resto], weights=x * y, minlength=n_itens)
+        sxx = np.bincount(item[com_resto], weights=x * x, minlength=n_itens)
+        syy = np.bincount(item[com_resto], weights=y * y, minlength=n_itens)
+        cov = sxy - sx * sy / k
+        ponto_bisserial = cov / np.sqrt((sxx - sx * sx / k) * (syy - sy * sy / k))
+
+        # Distrator: proporção que marcou a alternativa errada em cada grupo
+        errou = 1 - c
+        distrator_inferior = soma(errou, inferior) / soma(um, inferior)
+        distrator_superior = soma(errou, superior) / soma(um, superior)
+
+    # Tópico de cada questão (primeira ocorrência)
+    primeira = np.unique(item, return_index=True)[1]
+    topicos = df["chave_topico"].to_numpy()[primeira]
+
+    return pd.DataFrame({
+        "id_pergunta": np.asarray(ids),
+        "chave_topico": topicos,
+        "respostas": n.astype(np.int64),
+        "dificuldade": dificuldade,
+        "discriminacao": discriminacao,
+        "ponto_bisserial": ponto_bisserial,
+        "escolheu_v": soma(escolheu_v) / n,
+        "distrator_inferior": distrator_inferior,
+        "distrator_superior": distrator_superior,
+    }).round(3)
+
+
+def resumo_por_topico(itens):
+    return itens.groupby("chave_topico", observed=True).agg(
+        questoes=("id_pergunta", "size"),
+        respostas=("respostas", "sum"),
+        dificuldade_media=("dificuldade", "mean"),
+        discriminacao_media=("discriminacao", "mean"),
+        ponto_bisserial_medio=("ponto_bisserial", "mean"),
+    ).round(3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise de itens do log de respostas")
+    parser.add_argument("diretorio", nargs="?", default=DIRETORIO_PADRAO)
+    parser.add_argument("--saida", help="grava a tabela por questão neste CSV")
+    parser.add_argument("--banco", default=CAMINHO_BANCO, help="banco cujos aliases de ids são aplicados")
+    args = parser.parse_args()
+
+    itens = analisar(carregar_eventos(args.diretorio, carregar_banco(args.banco).aliases))
+    pd.set_option("display.width", 160)
+    print(resumo_por_topico(itens).to_string())
+    print()
+    print(itens.sort_values(["chave_topico", "id_pergunta"]).to_string(index=False))
+    if args.saida:
+        itens.to_csv(args.saida, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+from placar import RegistroResposta
+
+
+# Backend das respostas, escolhido pela variável de ambiente QUIZ_BACKEND:
+#   memoria (padrão)          -> dicionário no próprio processo
+#   sqlite:///caminho/arquivo -> arquivo SQLite compartilhado entre processos
+#   redis://host:porta/db     -> servidor Redis (ou compatível)
+# Além das respostas, cada backend guarda "estados" nomeados por sessão (ex.: a
+# agenda de revisão), como pares chave -> texto gravados um a um.
+# Com mais de um processo atrás do balanceador é preciso usar sqlite ou redis,
+# para que a sessão continue a mesma em qualquer worker.
+BACKEND_PADRAO = "memoria"
+
+
+def _serializar(registro):
+    return json.dumps([registro.chave_topico, registro.resposta, registro.correta,
+                       registro.instante.isoformat()])
+
+
+def _desserializar(texto):
+    chave_topico, resposta, correta, instante = json.loads(texto)
+    return RegistroResposta(chave_topico, resposta, correta, datetime.fromisoformat(instante))
+
+
+class ArmazenamentoMemoria:
+    def __init__(self):
+        self._sessoes = {}
+        self._estados = {}
+        self._lock = threading.Lock()
+
+    def carregar(self, id_sessao):
+        with self._lock:
+            return dict(self._sessoes.get(id_sessao, {}))
+
+    def salvar(self, id_sessao, id_pergunta, registro):
+        with self._lock:
+            self._sessoes.setdefault(id_sessao, {})[id_pergunta] = registro
+
+    def carregar_estado(self, id_sessao, nome):
+        with self._lock:
+            return dict(self._estados.get((id_sessao, nome), {}))
+
+    def salvar_estado(self, id_sessao, nome, chave, valor):
+        with self._lock:
+            estado = self._estados.setdefault((id_sessao, nome), {})
+            if valor is None:
+                estado.pop(chave, None)
+            else:
+                estado[chave] = valor
+
+
+class ArmazenamentoSQLite:
+    def __init__(self, caminho):
+        import sqlite3  # só o backend SQLite precisa do módulo
+
+        self.caminho = caminho
+        # Uma conexão por processo, compartilhada pelas threads e protegida por um
+        # lock. O Streamlit roda cada rerun numa thread nova, então uma conexão
+        # por thread abriria (e deixaria para o GC fechar) uma conexão por clique.
+        # Entre processos, quem coordena é o WAL do SQLite.
+        self._con = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+        with self._transacao() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS respostas (
+                    sessao TEXT NOT NULL,
+                    id_pergunta TEXT NOT NULL,
+                    registro TEXT NOT NULL,
+                    PRIMARY KEY (sessao, id_pergunta)
+                )
+            """)
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS estados (
+                    sessao TEXT NOT NULL,
+                    nome TEXT NOT NULL,
+                    chave TEXT NOT NULL,
+                    valor TEXT NOT NULL,
+                    PRIMARY KEY (sessao, nome, chave)
+                )
+            """)
+
+    @contextmanager
+    def _transacao(self):
+        with self._lock, self._con:
+            yield self._con
+
+    def _consultar(self, sql, parametros):
+        with self._lock:
+            return self._con.execute(sql, parametros).fetchall()
+
+    def carregar(self, id_sessao):
+        linhas = self._consultar("SELECT id_pergunta, registro FROM respostas WHERE sessao = ?", (id_sessao,))
+        return {id_pergunta: _desserializar(registro) for id_pergunta, registro in linhas}
+
+    def salvar(self, id_sessao, id_pergunta, registro):
+        with self._transacao() as con:
+            con.execute("INSERT OR REPLACE INTO respostas VALUES (?, ?, ?)",
+                        (id_sessao, id_pergunta, _serializar(registro)))
+
+    def carregar_estado(self, id_sessao, nome):
+        return dict(self._consultar("SELECT chave, valor FROM estados WHERE sessao = ? AND nome = ?",
+                                    (id_sessao, nome)))
+
+    def salvar_estado(self, id_sessao, nome, chave, valor):
+        with self._transacao() as con:
+            if valor is None:
+                con.execute("DELETE FROM estados WHERE sessao = ? AND nome = ? AND chave = ?",
+                            (id_sessao, nome, chave))
+            else:
+                con.execute("INSERT OR REPLACE INTO estados VALUES (?, ?, ?, ?)",
+                            (id_sessao, nome, chave, valor))
+
+
+class ArmazenamentoRedis:
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("O backend redis requer o pacote 'redis' (pip install redis)") from None
+        self._cliente = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _chave(id_sessao):
+        return f"quiz:sessao:{id_sessao}"
+
+    def carregar(self, id_sessao):
+        dados = self._cliente.hgetall(self._chave(id_sessao))
+        return {k.decode(): _desserializar(v.decode()) for k, v in dados.items()}
+
+    def salvar(self, id_sessao, id_pergunta, registro):
+        self._cliente.hset(self._chave(id_sessao), id_pergunta, _serializar(registro))
+
+    def carregar_estado(self, id_sessao, nome):
+        dados = self._cliente.hgetall(f"quiz:estado:{id_sessao}:{nome}")
+        return {k.decode(): v.decode() for k, v in dados.items()}
+
+    def salvar_estado(self, id_sessao, nome, chave, valor):
+        if valor is None:
+            self._cliente.hdel(f"quiz:estado:{id_sessao}:{nome}", chave)
+        else:
+            self._cliente.hset(f"quiz:estado:{id_sessao}:{nome}", chave, valor)
+
+
+def criar_armazenamento(url):
+    if url == "memoria":
+        return ArmazenamentoMemoria()
+    if url.startswith("sqlite:///"):
+        return ArmazenamentoSQLite(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return ArmazenamentoRedis(url)
+    raise ValueError(f"Backend de sessão desconhecido: {url!r}")
+
+
+# Um backend por processo, compartilhado por todas as sessões do worker
+@lru_cache(maxsize=None)
+def obter_armazenamento(url=None):
+    return criar_armazenamento(url or os.environ.get("QUIZ_BACKEND", BACKEND_PADRAO))
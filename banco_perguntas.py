@@ -0,0 +1,233 @@
+import json
+import os
+import threading
+import time
+import warnings
+from typing import NamedTuple
+
+from cache_lru import CacheLRU
+
+
+# Diretório padrão do banco de questões (pode ser trocado via variável de ambiente).
+# indice.json lista os tópicos e os ids das questões; o conteúdo de cada tópico
+# fica em <arquivo>.json e as justificativas em <arquivo>.justificativas.json,
+# para que só seja lido o que o aluno está vendo. O diretório é gerado por
+# compilar_banco.py a partir de fontes/.
+CAMINHO_BANCO = os.environ.get(
+    "QUIZ_BANCO",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "banco"),
+)
+
+# Quantos tópicos (e quantos arquivos de justificativas) ficam em memória por processo
+TOPICOS_EM_CACHE = int(os.environ.get("QUIZ_TOPICOS_EM_CACHE", "16"))
+
+# Intervalo mínimo, em segundos, entre verificações do indice.json em busca de uma versão nova
+INTERVALO_RECARGA = float(os.environ.get("QUIZ_INTERVALO_RECARGA", "2"))
+
+RESPOSTAS_VALIDAS = ("V", "F")
+
+
+class BancoInvalidoError(ValueError):
+    """Erro levantado quando o arquivo do banco de questões é inconsistente."""
+
+
+class Pergunta(NamedTuple):
+    id: str
+    pergunta: str
+    resposta_correta: str
+
+
+class ContagemTopico(NamedTuple):
+    """Agregados de um tópico, calculados por compilar_banco.py e gravados no índice."""
+    verdadeiras: int
+    falsas: int
+    caracteres_pergunta: int
+    caracteres_justificativa: int
+
+
+class Topico(NamedTuple):
+    chave: str
+    menu: str
+    titulo: str
+    descricao: str
+    emoji: str
+    total: int
+    arquivo: str
+    hash_conteudo: str = None  # gerado por compilar_banco.py; None em bancos editados à mão
+    contagem: ContagemTopico = None  # idem
+
+
+class Banco:
+    """Banco de questões com carga preguiçosa por tópico.
+
+    Só o índice (tópicos + ids) é lido na abertura. As perguntas de um tópico
+    são lidas e validadas no primeiro acesso, e as justificativas só quando
+    alguma questão do tópico é respondida; ambos ficam num cache LRU.
+    """
+
+    def __init__(self, caminho, versao, topicos, ids, similares=(), aliases=None, capacidade=TOPICOS_EM_CACHE):
+        self.caminho = caminho
+        self.versao = versao
+        self.topicos = topicos
+        self._por_chave = {t.chave: t for t in topicos}
+        self._por_menu = {t.menu: t for t in topicos}
+        self._ids = ids  # chave do tópico -> tupla de ids, na ordem do tópico
+        self._localizacao = {}  # id -> (chave do tópico, posição)
+        for chave, ids_topico in ids.items():
+            for posicao, id_pergunta in enumerate(ids_topico):
+                if id_pergunta in self._localizacao:
+                    raise BancoInvalidoError(f"Questão '{id_pergunta}' duplicada")
+                self._localizacao[id_pergunta] = (chave, posicao)
+        self._perguntas = CacheLRU(capacidade)
+        self._justificativas = CacheLRU(capacidade)
+        self._similares = {}  # id -> ((id da outra, similaridade), ...), mais parecida primeiro
+        for id_a, id_b, similaridade in similares:
+            if id_a in self._localizacao and id_b in self._localizacao:
+                self._similares[id_a] = self._similares.get(id_a, ()) + ((id_b, similaridade),)
+                self._similares[id_b] = self._similares.get(id_b, ()) + ((id_a, similaridade),)
+        # Ids antigos -> atuais (ver compilar_banco.py), para respostas gravadas antes de uma troca de ids
+        self.aliases = {antigo: atual for antigo, atual in (aliases or {}).items() if atual in self._localizacao}
+
+    def topico(self, chave):
+        return self._por_chave[chave]
+
+    def por_menu(self, menu):
+        return self._por_menu[menu]
+
+    def total(self):
+        return sum(t.total for t in self.topicos)
+
+    def __contains__(self, id_pergunta):
+        return id_pergunta in self._localizacao
+
+    def resolver(self, id_pergunta):
+        """Id atual de uma questão gravada com ``id_pergunta`` (que pode ser um alias), ou None."""
+        if id_pergunta in self._localizacao:
+            return id_pergunta
+        return self.aliases.get(id_pergunta)
+
+    def perguntas(self, chave):
+        topico = self._por_chave[chave]
+        return self._perguntas.obter(chave, lambda: self._ler_perguntas(topico))
+
+    def localizar(self, id_pergunta):
+        """Devolve ``(chave do tópico, Pergunta)`` de uma questão pelo id."""
+        chave, posicao = self._localizacao[id_pergunta]
+        return chave, self.perguntas(chave)[posicao]
+
+    def similares(self, id_pergunta):
+        """Quase duplicatas da questão detectadas na compilação do banco (ver duplicatas.py)."""
+        return self._similares.get(id_pergunta, ())
+
+    def justificativas(self, chave):
+        topico = self._por_chave[chave]
+        return self._justificativas.obter(chave, lambda: self._ler_justificativas(topico))
+
+    def justificativa(self, chave, id_pergunta):
+        """Justificativa da questão, ou None se ela não está (mais) neste banco."""
+        if chave not in self._por_chave:
+            return None
+        return self.justificativas(chave).get(id_pergunta)
+
+    def herdar(self, anterior):
+        """Aproveita o conteúdo já em memória de ``anterior`` nos tópicos que não mudaram."""
+        for t in self.topicos:
+            velho = anterior._por_chave.get(t.chave)
+            if (velho is None or t.hash_conteudo is None or velho.hash_conteudo != t.hash_conteudo
+                    or anterior._ids[t.chave] != self._ids[t.chave]):
+                continue
+            if t.chave in anterior._perguntas:
+                self._perguntas.obter(t.chave, lambda: anterior.perguntas(t.chave))
+            if t.chave in anterior._justificativas:
+                self._justificativas.obter(t.chave, lambda: anterior.justificativas(t.chave))
+
+    def _ler_json(self, arquivo):
+        with open(os.path.join(self.caminho, arquivo), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _ler_perguntas(self, topico):
+        brutas = self._ler_json(topico.arquivo)
+        perguntas = tuple(_validar_pergunta(q, topico.chave) for q in brutas)
+        if tuple(q.id for q in perguntas) != self._ids[topico.chave]:
+            raise BancoInvalidoError(f"Tópico '{topico.chave}': questões não batem com o índice")
+        return perguntas
+
+    def _ler_justificativas(self, topico):
+        base, ext = os.path.splitext(topico.arquivo)
+        justificativas = self._ler_json(f"{base}.justificativas{ext}")
+        if set(justificativas) != set(self._ids[topico.chave]):
+            raise BancoInvalidoError(f"Tópico '{topico.chave}': justificativas não batem com o índice")
+        for id_pergunta, texto in justificativas.items():
+            if not isinstance(texto, str) or not texto.strip():
+                raise BancoInvalidoError(f"Questão '{id_pergunta}': justificativa ausente ou vazia")
+        return justificativas
+
+
+def _validar_pergunta(bruta, chave_topico):
+    for campo in Pergunta._fields:
+        if not isinstance(bruta.get(campo), str) or not bruta[campo].strip():
+            raise BancoInvalidoError(f"Tópico '{chave_topico}': campo '{campo}' ausente ou vazio em {bruta!r}")
+    if bruta["resposta_correta"] not in RESPOSTAS_VALIDAS:
+        raise BancoInvalidoError(f"Questão '{bruta['id']}': resposta_correta deve ser V ou F")
+    return Pergunta(*(bruta[campo] for campo in Pergunta._fields))
+
+
+def carregar_banco(caminho=CAMINHO_BANCO, anterior=None):
+    """Lê e valida o índice do banco; o conteúdo dos tópicos é lido sob demanda.
+
+    Com ``anterior``, os tópicos com o mesmo conteúdo reaproveitam o que aquele
+    banco já tinha carregado.
+    """
+    with open(os.path.join(caminho, "indice.json"), encoding="utf-8") as f:
+        dados = json.load(f)
+
+    ids = {}
+    topicos = []
+    for t in dados.get("topicos", []):
+        try:
+            ids[t["chave"]] = tuple(t["ids"])
+            contagem = t.get("contagem")
+            if contagem is not None:
+                contagem = ContagemTopico(*(contagem[c] for c in ContagemTopico._fields))
+            topicos.append(Topico(t["chave"], t["menu"], t["titulo"], t["descricao"], t["emoji"],
+                                  len(t["ids"]), t["arquivo"], t.get("hash"), contagem))
+        except KeyError as e:
+            raise BancoInvalidoError(f"Tópico sem o campo obrigatório {e}") from None
+
+    banco = Banco(caminho, dados.get("versao", 1), tuple(topicos), ids, dados.get("similares", ()),
+                  dados.get("aliases"))
+    if anterior is not None:
+        banco.herdar(anterior)
+    return banco
+
+
+# Cache do processo: caminho -> (banco, mtime do índice, instante da próxima verificação)
+_bancos = {}
+_lock_bancos = threading.Lock()
+
+
+def obter_banco(caminho=CAMINHO_BANCO):
+    """Banco compartilhado entre as sessões, recarregado quando o indice.json muda.
+
+    O índice é verificado no máximo a cada INTERVALO_RECARGA segundos. Se a
+    versão nova for inválida, o processo continua com a anterior.
+    """
+    estado = _bancos.get(caminho)
+    if estado is not None and time.monotonic() < estado[2]:
+        return estado[0]
+    with _lock_bancos:
+        estado = _bancos.get(caminho)
+        agora = time.monotonic()
+        if estado is not None and agora < estado[2]:
+            return estado[0]
+        mtime = os.stat(os.path.join(caminho, "indice.json")).st_mtime_ns
+        banco = estado and estado[0]
+        if estado is None:
+            banco = carregar_banco(caminho)
+        elif mtime != estado[1]:
+            try:
+                banco = carregar_banco(caminho, anterior=banco)
+            except (OSError, ValueError) as e:
+                warnings.warn(f"Banco em {caminho} não recarregado: {e}")
+        _bancos[caminho] = (banco, mtime, agora + INTERVALO_RECARGA)
+        return banco
@@ -0,0 +1,150 @@
+"""Teste de carga e latência do quiz, sem navegador (AppTest do Streamlit).
+
+Simula N alunos concorrentes, cada um com sua própria sessão aberta, escolhendo
+tópicos no menu lateral e clicando em V/F. O AppTest não é thread-safe, então as
+ações dos alunos são intercaladas em ordem aleatória numa única thread, como um
+worker recebendo os cliques de várias sessões. Ao final mostra os
+percentis de latência dos reruns, elementos emitidos por rerun, pico de RSS e
+vazão. Os resultados podem ser gravados como baseline e comparados depois para
+pegar regressões em criar_secao/mostrar_pergunta.
+
+Obs.: o AppTest sempre reexecuta o script inteiro (não há reruns só de
+fragmento), então as latências aqui são um limite superior do custo por clique.
+O AppTest também cria um ScriptCache novo a cada run e recompila o script (com
+a reescrita "magic" do Streamlit) toda vez, enquanto o ``streamlit run`` o
+compila uma vez; aqui os alunos compartilham um único cache de bytecode, como
+no servidor, para que a latência não cresça com o número de linhas do app.
+
+Uso:
+    python benchmarks/carga.py --alunos 8 --acoes 30
+    python benchmarks/carga.py --salvar-baseline
+    python benchmarks/carga.py --comparar          # sai com código 1 se regredir
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "macroapp_p2_NOVO.py")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_carga.json")
+
+# Quanto cada métrica pode piorar em relação à baseline antes de ser regressão
+TOLERANCIA = {"p50_ms": 0.25, "p95_ms": 0.35, "elementos_por_rerun": 0.0, "pico_rss_mb": 0.25}
+
+
+def contar_elementos(no):
+    filhos = getattr(no, "children", None)
+    if not filhos:
+        return 1
+    return 1 + sum(contar_elementos(f) for f in filhos.values())
+
+
+def compartilhar_bytecode():
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import local_script_runner
+
+    cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: cache
+
+
+class Aluno:
+    def __init__(self, semente):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = random.Random(semente)
+        self.at = AppTest.from_file(APP, default_timeout=60).run()
+        self.topicos = self.at.sidebar.radio[0].options[1:]
+
+    def agir(self):
+        """Executa um clique ou uma troca de tópico e devolve (latência em ms, elementos)."""
+        at = self.at
+        botoes = [b for b in at.button if b.key and b.key[:2] in ("V_", "F_")]
+        inicio = time.perf_counter()
+        if botoes and self.rng.random() < 0.8:
+            self.rng.choice(botoes).click().run()
+        else:
+            at.sidebar.radio[0].set_value(self.rng.choice(self.topicos)).run()
+        latencia = (time.perf_counter() - inicio) * 1000
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return latencia, contar_elementos(at.main) + contar_elementos(at.sidebar)
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def executar(alunos, acoes, semente=0):
+    sys.path.insert(0, RAIZ)
+    # Respostas sintéticas não podem ir para o log de eventos real (lido pela análise de itens)
+    os.environ.setdefault("QUIZ_EVENTOS", "desligado")
+    compartilhar_bytecode()
+    turma = [Aluno(semente + i) for i in range(alunos)]
+    fila = [a for a in turma for _ in range(acoes)]
+    random.Random(semente).shuffle(fila)
+
+    latencias, elementos = [], []
+    inicio = time.perf_counter()
+    for aluno in fila:
+        latencia, n = aluno.agir()
+        latencias.append(latencia)
+        elementos.append(n)
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "alunos": alunos,
+        "reruns": len(latencias),
+        "p50_ms": round(percentil(latencias, 50), 2),
+        "p95_ms": round(percentil(latencias, 95), 2),
+        "p99_ms": round(percentil(latencias, 99), 2),
+        "elementos_por_rerun": round(statistics.mean(elementos), 1),
+        # ru_maxrss vem em KiB no Linux
+        "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "vazao_reruns_s": round(len(latencias) / duracao, 1),
+    }
+
+
+def comparar(resultado, baseline):
+    regressoes = []
+    for metrica, tolerancia in TOLERANCIA.items():
+        limite = baseline[metrica] * (1 + tolerancia)
+        if resultado[metrica] > limite:
+            regressoes.append(f"{metrica}: {resultado[metrica]} > {limite:.2f} (baseline {baseline[metrica]})")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alunos", type=int, default=8)
+    parser.add_argument("--acoes", type=int, default=30, help="cliques/navegações por aluno")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--comparar", action="store_true")
+    args = parser.parse_args()
+
+    resultado = executar(args.alunos, args.acoes, args.semente)
+    for metrica, valor in resultado.items():
+        print(f"{metrica:>20}: {valor}")
+
+    if args.salvar_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2)
+            f.write("\n")
+        print(f"Baseline gravada em {BASELINE}")
+
+    if args.comparar:
+        with open(BASELINE, encoding="utf-8") as f:
+            regressoes = comparar(resultado, json.load(f))
+        for r in regressoes:
+            print("REGRESSÃO", r)
+        sys.exit(1 if regressoes else 0)
+
+
+if __name__ == "__main__":
+    main()
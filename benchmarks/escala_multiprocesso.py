@@ -0,0 +1,167 @@
+"""Mede como o app escala com o número de processos (modo multiprocesso).
+
+Modo padrão: cada processo simula alunos clicando em V/F com o AppTest do
+Streamlit, todos gravando no mesmo backend SQLite, e o total de reruns por
+segundo é comparado com o de um único processo. Mede o custo do script e do
+backend, mas não passa pelo balanceador nem por um ``streamlit run``.
+
+Com ``--implantacao`` sobe a implantação de verdade (multiprocesso.py: workers
+``streamlit run`` + balanceador round-robin) e a exercita por HTTP através do
+balanceador: confere que todos os workers respondem, que o balanceador entrega
+a página do app e mede requisições por segundo com clientes concorrentes.
+
+Uso:
+    python benchmarks/escala_multiprocesso.py --max-processos 4 --duracao 10
+    python benchmarks/escala_multiprocesso.py --implantacao --max-processos 4
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "macroapp_p2_NOVO.py")
+
+
+def _worker(args):
+    backend, duracao, semente = args
+    os.environ["QUIZ_BACKEND"] = backend
+    # Respostas sintéticas não podem ir para o log de eventos real (lido pela análise de itens)
+    os.environ.setdefault("QUIZ_EVENTOS", "desligado")
+    sys.path.insert(0, RAIZ)
+    from streamlit.testing.v1 import AppTest
+
+    from banco_perguntas import obter_banco
+
+    rng = random.Random(semente)
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    # Só as páginas de tópico: Ranking não tem botões de resposta e a Revisão
+    # fica vazia enquanto o aluno não errar nada
+    topicos = [t.menu for t in obter_banco().topicos]
+    reruns = 0
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    while time.perf_counter() < fim:
+        at.sidebar.radio[0].set_value(rng.choice(topicos)).run()
+        reruns += 1
+        botoes = [b for b in at.button if b.key and b.key[:2] in ("V_", "F_")]
+        if botoes:
+            rng.choice(botoes).click().run()
+            reruns += 1
+    return reruns / (time.perf_counter() - inicio)
+
+
+def medir(processos, duracao, backend):
+    # Soma das vazões medidas dentro de cada processo (sem o custo de inicialização)
+    with multiprocessing.get_context("spawn").Pool(processos) as pool:
+        return sum(pool.map(_worker, [(backend, duracao, i) for i in range(processos)]))
+
+
+def _portas_livres(quantidade):
+    """Primeira de ``quantidade`` portas consecutivas livres."""
+    rng = random.Random()
+    for _ in range(100):
+        base = rng.randrange(20000, 60000 - quantidade)
+        try:
+            for porta in range(base, base + quantidade):
+                with socket.socket() as s:
+                    s.bind(("127.0.0.1", porta))
+            return base
+        except OSError:
+            continue
+    raise RuntimeError("Nenhuma faixa de portas livre")
+
+
+def _get(porta, caminho, timeout=5):
+    with urllib.request.urlopen(f"http://127.0.0.1:{porta}{caminho}", timeout=timeout) as resposta:
+        resposta.read()
+        return resposta.status
+
+
+def _esperar(porta, limite):
+    while time.monotonic() < limite:
+        try:
+            if _get(porta, "/_stcore/health") == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Worker na porta {porta} não respondeu a tempo")
+
+
+def medir_implantacao(workers, duracao, backend, clientes=8):
+    """Sobe multiprocesso.py e devolve requisições/s pelo balanceador (cada uma numa conexão nova)."""
+    base = _portas_livres(workers + 1)
+    porta, porta_base = base, base + 1
+    env = dict(os.environ, QUIZ_BACKEND=backend)
+    env.setdefault("QUIZ_EVENTOS", "desligado")
+    processo = subprocess.Popen(
+        [sys.executable, os.path.join(RAIZ, "multiprocesso.py"), "--workers", str(workers),
+         "--porta", str(porta), "--porta-base", str(porta_base)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        limite = time.monotonic() + 60
+        for p in range(porta_base, porta_base + workers):
+            _esperar(p, limite)
+        _esperar(porta, limite)
+        # A página do app também precisa passar pelo balanceador
+        if _get(porta, "/") != 200:
+            raise RuntimeError("Balanceador não entregou a página do app")
+
+        contagens, erros = [0] * clientes, [0] * clientes
+        fim = time.monotonic() + duracao
+
+        def cliente(i):
+            while time.monotonic() < fim:
+                try:
+                    _get(porta, "/_stcore/health")
+                    contagens[i] += 1
+                except OSError:
+                    erros[i] += 1
+
+        threads = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return sum(contagens) / duracao, sum(erros)
+    finally:
+        processo.send_signal(signal.SIGINT)
+        try:
+            processo.wait(30)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duracao", type=float, default=10.0, help="segundos por medição")
+    parser.add_argument("--implantacao", action="store_true",
+                        help="mede a implantação real (multiprocesso.py) por HTTP")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        backend = "sqlite:///" + os.path.join(pasta, "sessoes.db")
+        base = None
+        for n in range(1, args.max_processos + 1):
+            if args.implantacao:
+                vazao, erros = medir_implantacao(n, args.duracao, backend)
+                base = base or vazao
+                print(f"{n} worker(s): {vazao:8.1f} req/s pelo balanceador  (x{vazao / base:.2f}, {erros} erros)")
+            else:
+                vazao = medir(n, args.duracao, backend)
+                base = base or vazao
+                print(f"{n} processo(s): {vazao:8.1f} reruns/s  (x{vazao / base:.2f})")
+
+
+if __name__ == "__main__":
+    main()
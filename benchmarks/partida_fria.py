@@ -0,0 +1,133 @@
+"""Tempo de partida a frio do quiz: importações e primeira renderização.
+
+Cada amostra roda num processo Python novo e mede:
+
+- importacao_ms: importar os módulos do próprio app (os que o script importa e
+  que estão na raiz do repositório), com o Streamlit já carregado, como acontece
+  num worker do ``streamlit run``;
+- primeira_renderizacao_ms: primeira execução do script para uma sessão nova
+  num processo novo (banco, índices e fragmentos ainda frios);
+- nova_sessao_ms: primeira execução de uma segunda sessão no mesmo processo,
+  isto é, o que um aluno que chega depois paga.
+
+O resultado é a mediana das amostras. ``--orcamento-importacao`` faz o script
+sair com código 1 se as importações passarem do limite, e a baseline funciona
+como em carga.py.
+
+Uso:
+    python benchmarks/partida_fria.py --amostras 5
+    python benchmarks/partida_fria.py --orcamento-importacao 30
+    python benchmarks/partida_fria.py --salvar-baseline
+    python benchmarks/partida_fria.py --comparar
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "macroapp_p2_NOVO.py")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_partida.json")
+
+TOLERANCIA = {"importacao_ms": 0.5, "primeira_renderizacao_ms": 0.35, "nova_sessao_ms": 0.35}
+
+# Executado em cada processo filho; imprime um JSON com as três medidas
+AMOSTRA = """
+import importlib, json, sys, time
+sys.path.insert(0, {raiz!r})
+from streamlit.testing.v1 import AppTest
+
+inicio = time.perf_counter()
+for modulo in {modulos!r}:
+    importlib.import_module(modulo)
+importacao = time.perf_counter() - inicio
+
+inicio = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=60).run()
+primeira = time.perf_counter() - inicio
+assert not at.exception, at.exception
+
+inicio = time.perf_counter()
+AppTest.from_file({app!r}, default_timeout=60).run()
+nova = time.perf_counter() - inicio
+
+print(json.dumps({{"importacao_ms": importacao * 1000, "primeira_renderizacao_ms": primeira * 1000,
+                  "nova_sessao_ms": nova * 1000}}))
+"""
+
+
+def modulos_do_app():
+    """Módulos importados no topo do script que pertencem ao repositório."""
+    with open(APP, encoding="utf-8") as f:
+        arvore = ast.parse(f.read())
+    nomes = []
+    for no in arvore.body:
+        if isinstance(no, ast.Import):
+            nomes.extend(a.name for a in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.module:
+            nomes.append(no.module)
+    return [n for n in dict.fromkeys(nomes) if os.path.exists(os.path.join(RAIZ, f"{n}.py"))]
+
+
+def amostrar():
+    codigo = AMOSTRA.format(raiz=RAIZ, app=APP, modulos=modulos_do_app())
+    ambiente = dict(os.environ, QUIZ_EVENTOS=os.environ.get("QUIZ_EVENTOS", "desligado"))
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, env=ambiente,
+                           capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def executar(amostras):
+    medidas = [amostrar() for _ in range(amostras)]
+    resultado = {"amostras": amostras}
+    for metrica in TOLERANCIA:
+        resultado[metrica] = round(statistics.median(m[metrica] for m in medidas), 2)
+    return resultado
+
+
+def comparar(resultado, baseline):
+    regressoes = []
+    for metrica, tolerancia in TOLERANCIA.items():
+        limite = baseline[metrica] * (1 + tolerancia)
+        if resultado[metrica] > limite:
+            regressoes.append(f"{metrica}: {resultado[metrica]} > {limite:.2f} (baseline {baseline[metrica]})")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--amostras", type=int, default=5)
+    parser.add_argument("--orcamento-importacao", type=float, metavar="MS",
+                        help="falha se a mediana das importações do app passar deste valor")
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--comparar", action="store_true")
+    args = parser.parse_args()
+
+    resultado = executar(args.amostras)
+    for metrica, valor in resultado.items():
+        print(f"{metrica:>25}: {valor}")
+
+    falhas = []
+    if args.orcamento_importacao is not None and resultado["importacao_ms"] > args.orcamento_importacao:
+        falhas.append(f"importacao_ms: {resultado['importacao_ms']} > orçamento {args.orcamento_importacao}")
+
+    if args.salvar_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2)
+            f.write("\n")
+        print(f"Baseline gravada em {BASELINE}")
+
+    if args.comparar:
+        with open(BASELINE, encoding="utf-8") as f:
+            falhas.extend(comparar(resultado, json.load(f)))
+
+    for falha in falhas:
+        print("REGRESSÃO", falha)
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import heapq
+import math
+import re
+import unicodedata
+import weakref
+from bisect import bisect_left
+from typing import NamedTuple
+
+# Palavras muito comuns que só incham as listas invertidas. "não" fica de fora
+# de propósito: em questões de V/F ela muda o sentido da frase.
+STOPWORDS = frozenset("""
+a as o os um uma uns umas de do da dos das no na nos nas em e ou que se por para
+pelo pela pelos pelas com ao aos seu sua seus suas como ser sao
+""".split())
+
+PESO_PERGUNTA = 2.0
+PESO_JUSTIFICATIVA = 1.0
+MAX_EXPANSOES_PREFIXO = 50
+MIN_PREFIXO = 3
+
+_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar(texto):
+    """Minúsculas e sem acentos: "Expectativas" -> "expectativas", "p̂" -> "p"."""
+    decomposto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    return [t for t in _PALAVRA.findall(normalizar(texto)) if t not in STOPWORDS]
+
+
+class Resultado(NamedTuple):
+    pontuacao: float
+    chave_topico: str
+    posicao: int  # posição da questão no tópico (começa em 1)
+    id_pergunta: str
+
+
+class IndiceBusca:
+    """Índice invertido sobre pergunta + justificativa de todas as questões.
+
+    ``postings`` leva cada termo a ``{documento: peso}`` já com o IDF aplicado, e
+    ``vocabulario`` é a lista ordenada de termos, usada para completar o último
+    termo digitado por prefixo (busca binária). Uma consulta só toca as listas
+    dos termos que aparecem nela. O índice guarda só os ids, não os textos; o
+    banco lê cada tópico durante a montagem e depois pode descartá-lo do cache.
+    """
+
+    __slots__ = ("documentos", "postings", "vocabulario")
+
+    def __init__(self, banco):
+        self.documentos = []
+        frequencias = {}
+        for t in banco.topicos:
+            justificativas = banco.justificativas(t.chave)
+            for posicao, q in enumerate(banco.perguntas(t.chave), 1):
+                doc = len(self.documentos)
+                self.documentos.append((t.chave, posicao, q.id))
+                for texto, peso in ((q.pergunta, PESO_PERGUNTA), (justificativas[q.id], PESO_JUSTIFICATIVA)):
+                    for termo in tokenizar(texto):
+                        por_doc = frequencias.setdefault(termo, {})
+                        por_doc[doc] = por_doc.get(doc, 0.0) + peso
+
+        n = len(self.documentos)
+        self.postings = {}
+        for termo, por_doc in frequencias.items():
+            idf = math.log(1 + n / len(por_doc))
+            self.postings[termo] = {doc: (1 + math.log(tf)) * idf for doc, tf in por_doc.items()}
+        self.vocabulario = sorted(self.postings)
+
+    def _expandir(self, prefixo):
+        i = bisect_left(self.vocabulario, prefixo)
+        termos = []
+        while i < len(self.vocabulario) and self.vocabulario[i].startswith(prefixo):
+            termos.append(self.vocabulario[i])
+            if len(termos) >= MAX_EXPANSOES_PREFIXO:
+                break
+            i += 1
+        return termos
+
+    def buscar(self, consulta, limite=10):
+        termos = tokenizar(consulta)
+        if not termos:
+            return []
+
+        pontuacoes = {}
+        for i, termo in enumerate(termos):
+            # O último termo pode estar incompleto (o aluno ainda está digitando)
+            if i == len(termos) - 1 and len(termo) >= MIN_PREFIXO:
+                candidatos = self._expandir(termo)
+            else:
+                candidatos = [termo]
+            for candidato in candidatos:
+                for doc, peso in self.postings.get(candidato, {}).items():
+                    pontuacoes[doc] = pontuacoes.get(doc, 0.0) + peso
+
+        melhores = heapq.nlargest(limite, pontuacoes.items(), key=lambda item: item[1])
+        return [Resultado(round(p, 3), *self.documentos[doc]) for doc, p in melhores]
+
+
+# Um índice por banco carregado (mesmo esquema de simulado.indice_amostragem):
+# as referências fracas deixam o índice sair junto com o banco após uma recarga
+_indices = weakref.WeakKeyDictionary()
+
+
+def indice_busca(banco):
+    indice = _indices.get(banco)
+    if indice is None:
+        indice = _indices[banco] = IndiceBusca(banco)
+    return indice
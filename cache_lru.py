@@ -0,0 +1,45 @@
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """Dicionário limitado com descarte do item usado há mais tempo.
+
+    Thread-safe: o Streamlit atende várias sessões em threads do mesmo processo.
+    ``obter`` monta o valor fora do lock, então duas threads podem montar o mesmo
+    item ao mesmo tempo; a primeira a terminar é a que fica no cache.
+    """
+
+    __slots__ = ("capacidade", "_itens", "_lock")
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def obter(self, chave, montar):
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                return self._itens[chave]
+        valor = montar()
+        with self._lock:
+            valor = self._itens.setdefault(chave, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+        return valor
+
+    def descartar(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
@@ -0,0 +1,275 @@
+"""Compila o banco de questões a partir das fontes de cada tópico.
+
+As fontes ficam em ``fontes/``: ``topicos.json`` com a ordem e os metadados dos
+tópicos e um arquivo por tópico, em Markdown ou CSV. No Markdown cada questão
+começa com um título com a resposta correta; as linhas citadas são a
+justificativa:
+
+    ## V
+    Enunciado da questão, em uma ou mais linhas.
+
+    > Justificativa, em uma ou mais linhas.
+
+O CSV tem as colunas ``resposta,pergunta,justificativa``.
+
+Cada questão recebe um id derivado do enunciado (``<chave>-<hash>``), então
+reordenar questões ou corrigir uma justificativa não muda ids nem invalida
+respostas já registradas. O ``aliases.json`` opcional das fontes mapeia ids
+antigos para os atuais (os ids ordinais ``<chave>-01`` de antes da compilação,
+por exemplo) e vai para o índice, para que respostas, agendas de revisão e
+eventos gravados com eles continuem valendo; aliases cujo destino saiu do banco
+são descartados. A saída é o diretório ``banco/`` lido por
+banco_perguntas.py. Os arquivos de cada tópico levam o hash do conteúdo no nome
+e só são regravados quando a fonte do tópico muda; as contagens de cada tópico
+(V/F e tamanho dos textos) vão para o índice, de onde estatisticas.py as lê sem
+abrir o conteúdo. O indice.json é trocado por último, de forma atômica, e os
+apps em execução passam a usar a versão nova na próxima verificação do índice
+(ver banco_perguntas.obter_banco).
+
+A cada compilação os enunciados de todos os tópicos passam pela detecção de
+quase duplicatas (duplicatas.py); os pares encontrados são listados na saída e
+gravados no índice, para que o app os sinalize no simulado e na revisão.
+
+Uso:
+    python compilar_banco.py [--fontes fontes] [--saida banco]
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+from banco_perguntas import CAMINHO_BANCO, RESPOSTAS_VALIDAS, BancoInvalidoError, ContagemTopico
+from duplicatas import encontrar_duplicatas
+
+CAMINHO_FONTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fontes")
+CAMPOS_TOPICO = ("chave", "menu", "titulo", "descricao", "emoji", "fonte")
+COLUNAS_CSV = ("resposta", "pergunta", "justificativa")
+
+
+class QuestaoFonte(NamedTuple):
+    linha: int
+    resposta: str
+    pergunta: str
+    justificativa: str
+
+
+class Compilacao(NamedTuple):
+    versao: int
+    reconstruidos: tuple  # chaves dos tópicos regravados
+    reaproveitados: tuple
+    similares: tuple      # [id_a, id_b, similaridade] de cada par de quase duplicatas
+
+
+def _hash(dados):
+    return hashlib.sha1(dados).hexdigest()
+
+
+def _texto(linhas):
+    return " ".join(" ".join(linhas).split())
+
+
+def id_questao(chave_topico, pergunta):
+    """Id estável da questão: só depende do tópico e do enunciado (espaços normalizados)."""
+    return f"{chave_topico}-{_hash(_texto([pergunta]).casefold().encode('utf-8'))[:10]}"
+
+
+def ler_markdown(caminho):
+    questoes = []
+    atual = None  # [linha, resposta, linhas da pergunta, linhas da justificativa]
+    with open(caminho, encoding="utf-8") as f:
+        for numero, linha in enumerate(f, 1):
+            linha = linha.strip()
+            if linha.startswith("## "):
+                if atual:
+                    questoes.append(atual)
+                atual = [numero, linha[3:].strip(), [], []]
+            elif atual is None:
+                if linha:
+                    raise BancoInvalidoError(f"{caminho}:{numero}: texto fora de uma questão")
+            elif linha.startswith(">"):
+                atual[3].append(linha[1:])
+            elif linha:
+                atual[2].append(linha)
+    if atual:
+        questoes.append(atual)
+    return [QuestaoFonte(n, r, _texto(p), _texto(j)) for n, r, p, j in questoes]
+
+
+def ler_csv(caminho):
+    with open(caminho, newline="", encoding="utf-8") as f:
+        leitor = csv.DictReader(f)
+        faltando = set(COLUNAS_CSV) - set(leitor.fieldnames or ())
+        if faltando:
+            raise BancoInvalidoError(f"{caminho}: colunas ausentes: {', '.join(sorted(faltando))}")
+        # linha 1 é o cabeçalho
+        return [QuestaoFonte(n, l["resposta"] or "", _texto([l["pergunta"] or ""]),
+                             _texto([l["justificativa"] or ""]))
+                for n, l in enumerate(leitor, 2)]
+
+
+LEITORES = {".md": ler_markdown, ".csv": ler_csv}
+
+
+def compilar_topico(chave, caminho):
+    """Lê e valida a fonte de um tópico; devolve ``(perguntas, justificativas)`` já no formato do banco."""
+    leitor = LEITORES.get(os.path.splitext(caminho)[1].lower())
+    if leitor is None:
+        raise BancoInvalidoError(f"{caminho}: formato não suportado (use .md ou .csv)")
+
+    perguntas, justificativas, linhas = [], {}, {}
+    for q in leitor(caminho):
+        origem = f"{caminho}:{q.linha}"
+        resposta = q.resposta.strip().upper()
+        if resposta not in RESPOSTAS_VALIDAS:
+            raise BancoInvalidoError(f"{origem}: resposta deve ser V ou F, não {q.resposta!r}")
+        if not q.pergunta:
+            raise BancoInvalidoError(f"{origem}: enunciado vazio")
+        if not q.justificativa:
+            raise BancoInvalidoError(f"{origem}: justificativa vazia")
+        id_pergunta = id_questao(chave, q.pergunta)
+        if id_pergunta in linhas:
+            raise BancoInvalidoError(f"{origem}: questão repetida (mesmo enunciado da linha {linhas[id_pergunta]})")
+        linhas[id_pergunta] = q.linha
+        perguntas.append({"id": id_pergunta, "pergunta": q.pergunta, "resposta_correta": resposta})
+        justificativas[id_pergunta] = q.justificativa
+    if not perguntas:
+        raise BancoInvalidoError(f"{caminho}: nenhuma questão")
+    return perguntas, justificativas
+
+
+def contar_topico(perguntas, justificativas):
+    """Agregados do tópico que vão para o índice, para as estatísticas não lerem o conteúdo."""
+    verdadeiras = sum(q["resposta_correta"] == "V" for q in perguntas)
+    return ContagemTopico(verdadeiras, len(perguntas) - verdadeiras,
+                          sum(len(q["pergunta"]) for q in perguntas),
+                          sum(map(len, justificativas.values())))._asdict()
+
+
+def _gravar_json(caminho, dados):
+    # Grava ao lado e troca de uma vez, para que um app lendo o arquivo nunca veja metade dele
+    temporario = f"{caminho}.tmp-{os.getpid()}"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(temporario, caminho)
+
+
+def _ler_indice(saida):
+    try:
+        with open(os.path.join(saida, "indice.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"versao": 0, "topicos": []}
+
+
+def _arquivos_do_indice(indice):
+    arquivos = set()
+    for t in indice.get("topicos", []):
+        base, ext = os.path.splitext(t["arquivo"])
+        arquivos.update((t["arquivo"], f"{base}.justificativas{ext}"))
+    return arquivos
+
+
+def _ler_aliases(fontes, ids):
+    """Aliases ``{id antigo: id atual}`` das fontes, só os que ainda apontam para uma questão do banco."""
+    try:
+        with open(os.path.join(fontes, "aliases.json"), encoding="utf-8") as f:
+            aliases = json.load(f)
+    except FileNotFoundError:
+        return {}
+    for antigo in aliases:
+        if antigo in ids:
+            raise BancoInvalidoError(f"aliases.json: {antigo!r} é o id de uma questão atual")
+    return {antigo: atual for antigo, atual in sorted(aliases.items()) if atual in ids}
+
+
+def compilar(fontes=CAMINHO_FONTES, saida=CAMINHO_BANCO):
+    """Compila ``fontes`` em ``saida``, regravando só os tópicos cuja fonte mudou."""
+    with open(os.path.join(fontes, "topicos.json"), encoding="utf-8") as f:
+        definicoes = json.load(f)
+    os.makedirs(saida, exist_ok=True)
+    anterior = _ler_indice(saida)
+    anteriores = {t["chave"]: t for t in anterior.get("topicos", [])}
+
+    topicos, reconstruidos, reaproveitados = [], [], []
+    enunciados = []  # (id, enunciado) de todo o banco, para a detecção de duplicatas
+    for definicao in definicoes:
+        faltando = [c for c in CAMPOS_TOPICO if not definicao.get(c)]
+        if faltando:
+            raise BancoInvalidoError(f"topicos.json: tópico {definicao!r} sem {', '.join(faltando)}")
+        chave = definicao["chave"]
+        caminho = os.path.join(fontes, definicao["fonte"])
+        with open(caminho, "rb") as f:
+            hash_fonte = _hash(f.read())
+
+        metadados = {c: definicao[c] for c in CAMPOS_TOPICO if c != "fonte"}
+        velho = anteriores.get(chave)
+        # Índices anteriores às contagens por tópico passam pela compilação (sem regravar o conteúdo)
+        if (velho is not None and velho.get("hash_fonte") == hash_fonte and "contagem" in velho
+                and all(os.path.exists(os.path.join(saida, a)) for a in _arquivos_do_indice({"topicos": [velho]}))):
+            topicos.append({**metadados, **{c: velho[c] for c in ("arquivo", "hash", "hash_fonte", "ids",
+                                                                   "contagem")}})
+            reaproveitados.append(chave)
+            with open(os.path.join(saida, velho["arquivo"]), encoding="utf-8") as f:
+                enunciados.extend((q["id"], q["pergunta"]) for q in json.load(f))
+            continue
+
+        perguntas, justificativas = compilar_topico(chave, caminho)
+        hash_conteudo = _hash(json.dumps([perguntas, justificativas], ensure_ascii=False,
+                                         sort_keys=True).encode("utf-8"))[:12]
+        arquivo = f"{chave}.{hash_conteudo}.json"
+        if not (velho is not None and velho.get("hash") == hash_conteudo):
+            _gravar_json(os.path.join(saida, arquivo), perguntas)
+            _gravar_json(os.path.join(saida, f"{chave}.{hash_conteudo}.justificativas.json"), justificativas)
+            reconstruidos.append(chave)
+        else:
+            reaproveitados.append(chave)
+        topicos.append({**metadados, "arquivo": arquivo, "hash": hash_conteudo, "hash_fonte": hash_fonte,
+                        "ids": [q["id"] for q in perguntas],
+                        "contagem": contar_topico(perguntas, justificativas)})
+        enunciados.extend((q["id"], q["pergunta"]) for q in perguntas)
+
+    chaves = [t["chave"] for t in topicos]
+    if len(set(chaves)) != len(chaves):
+        raise BancoInvalidoError("topicos.json: chave de tópico repetida")
+
+    similares = [[p.id_a, p.id_b, p.similaridade] for p in encontrar_duplicatas(enunciados)]
+    aliases = _ler_aliases(fontes, {id_pergunta for id_pergunta, _ in enunciados})
+
+    if (topicos == anterior.get("topicos") and similares == anterior.get("similares", [])
+            and aliases == anterior.get("aliases", {})):
+        return Compilacao(anterior["versao"], (), tuple(reaproveitados), tuple(map(tuple, similares)))
+
+    versao = anterior.get("versao", 0) + 1
+    novo = {"versao": versao, "topicos": topicos, "similares": similares, "aliases": aliases}
+    _gravar_json(os.path.join(saida, "indice.json"), novo)
+
+    # Arquivos da versão anterior ficam para os apps que ainda não trocaram de
+    # índice; os de versões mais antigas são apagados
+    em_uso = _arquivos_do_indice(novo) | _arquivos_do_indice(anterior)
+    for nome in os.listdir(saida):
+        if nome.endswith(".json") and nome != "indice.json" and nome not in em_uso:
+            os.remove(os.path.join(saida, nome))
+    return Compilacao(versao, tuple(reconstruidos), tuple(reaproveitados), tuple(map(tuple, similares)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila o banco de questões a partir das fontes")
+    parser.add_argument("--fontes", default=CAMINHO_FONTES)
+    parser.add_argument("--saida", default=CAMINHO_BANCO)
+    args = parser.parse_args()
+
+    try:
+        resultado = compilar(args.fontes, args.saida)
+    except BancoInvalidoError as e:
+        parser.exit(1, f"erro: {e}\n")
+    print(f"versão {resultado.versao}; reconstruídos: {', '.join(resultado.reconstruidos) or '-'}; "
+          f"sem mudanças: {', '.join(resultado.reaproveitados) or '-'}")
+    for id_a, id_b, similaridade in resultado.similares:
+        print(f"possível duplicata ({similaridade:.2f}): {id_a} ~ {id_b}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Os módulos do app ficam na raiz do repositório: com este conftest o pytest põe
+# a raiz no sys.path, e os testes de tests/ rodam também com ``pytest`` puro
@@ -0,0 +1,123 @@
+"""Detecção de questões quase duplicadas com MinHash + LSH.
+
+Cada enunciado vira um conjunto de shingles: as palavras sem acentos, em
+minúsculas e sem stopwords (ver busca.tokenizar), cortadas nos primeiros
+RADICAL caracteres para que "expectativa"/"expectativas" e "informação"/
+"informações" contem como a mesma palavra. A assinatura MinHash estima a
+similaridade de Jaccard entre dois conjuntos; o LSH divide a assinatura em
+bandas e só compara pares que caem no mesmo balde em alguma banda, então o
+custo cresce com o número de questões e de pares candidatos, não com n².
+Os candidatos são confirmados pelo Jaccard exato dos shingles.
+
+compilar_banco.py roda a detecção a cada compilação e grava os pares no
+indice.json; o app os mostra nas páginas de simulado e revisão.
+
+Uso:
+    python duplicatas.py [--banco DIR] [--limiar 0.4]
+"""
+import argparse
+import zlib
+from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
+
+from busca import normalizar, tokenizar
+
+RADICAL = 5
+# 42 bandas de 3 linhas: um par com Jaccard 0,4 vira candidato com ~94% de
+# chance, um com 0,2 com ~29% e um com 0,05 com ~0,5%
+BANDAS = 42
+LINHAS_POR_BANDA = 3
+PERMUTACOES = BANDAS * LINHAS_POR_BANDA
+LIMIAR = 0.4
+ITENS_POR_LOTE = 2000
+_PRIMO = (1 << 32) + 15  # primo acima de 2^32, para as permutações (a·h + b) mod p
+
+
+class ParSimilar(NamedTuple):
+    similaridade: float  # Jaccard exato dos shingles
+    id_a: str
+    id_b: str
+
+
+def shingles(texto):
+    conjunto = {palavra[:RADICAL] for palavra in tokenizar(texto)}
+    # Enunciado só com stopwords: o texto inteiro vira o único shingle
+    return conjunto or {normalizar(texto)}
+
+
+def assinaturas(conjuntos, permutacoes=PERMUTACOES, semente=0):
+    """Matriz (n, permutacoes) de assinaturas MinHash, uma linha por conjunto (não vazio)."""
+    rng = np.random.default_rng(semente)
+    # a < 2^31 e h < 2^32: a·h + b cabe em uint64 sem estourar
+    a = rng.integers(1, 1 << 31, size=permutacoes, dtype=np.uint64)[:, None]
+    b = rng.integers(0, 1 << 32, size=permutacoes, dtype=np.uint64)[:, None]
+    resultado = np.empty((len(conjuntos), permutacoes), dtype=np.uint64)
+    # Em lotes: os hashes de vários conjuntos são permutados de uma vez e o
+    # mínimo de cada conjunto sai de um reduceat sobre os seus trechos
+    for inicio in range(0, len(conjuntos), ITENS_POR_LOTE):
+        lote = conjuntos[inicio:inicio + ITENS_POR_LOTE]
+        tamanhos = np.fromiter((len(c) for c in lote), dtype=np.int64, count=len(lote))
+        h = np.fromiter((zlib.crc32(s.encode("utf-8")) for c in lote for s in c), dtype=np.uint64,
+                        count=int(tamanhos.sum()))
+        inicios = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+        resultado[inicio:inicio + len(lote)] = np.minimum.reduceat((a * h + b) % _PRIMO, inicios, axis=1).T
+    return resultado
+
+
+def candidatos(matriz, linhas=LINHAS_POR_BANDA):
+    """Pares (i, j), i < j, que coincidem em todas as linhas de alguma banda."""
+    pares = set()
+    for banda in range(matriz.shape[1] // linhas):
+        baldes = defaultdict(list)
+        fatia = np.ascontiguousarray(matriz[:, banda * linhas:(banda + 1) * linhas])
+        for i, linha in enumerate(fatia):
+            baldes[linha.tobytes()].append(i)
+        for balde in baldes.values():
+            for x, i in enumerate(balde):
+                for j in balde[x + 1:]:
+                    pares.add((i, j))
+    return pares
+
+
+def encontrar_duplicatas(itens, limiar=LIMIAR):
+    """Recebe ``[(id, texto)]`` e devolve os ParSimilar com Jaccard >= limiar, do mais parecido ao menos."""
+    if len(itens) < 2:
+        return []
+    conjuntos = [shingles(texto) for _, texto in itens]
+    pares = []
+    for i, j in candidatos(assinaturas(conjuntos)):
+        a, b = conjuntos[i], conjuntos[j]
+        similaridade = len(a & b) / len(a | b)
+        if similaridade >= limiar:
+            pares.append(ParSimilar(round(similaridade, 3), *sorted((itens[i][0], itens[j][0]))))
+    pares.sort(key=lambda p: (-p.similaridade, p.id_a, p.id_b))
+    return pares
+
+
+def duplicatas_do_banco(banco, limiar=LIMIAR):
+    return encontrar_duplicatas([(q.id, q.pergunta) for t in banco.topicos for q in banco.perguntas(t.chave)],
+                                limiar)
+
+
+def main():
+    from banco_perguntas import CAMINHO_BANCO, carregar_banco
+
+    parser = argparse.ArgumentParser(description="Lista questões quase duplicadas do banco")
+    parser.add_argument("--banco", default=CAMINHO_BANCO)
+    parser.add_argument("--limiar", type=float, default=LIMIAR, help="Jaccard mínimo entre os shingles")
+    args = parser.parse_args()
+
+    banco = carregar_banco(args.banco)
+    pares = duplicatas_do_banco(banco, args.limiar)
+    for par in pares:
+        print(f"{par.similaridade:.2f}")
+        for id_pergunta in (par.id_a, par.id_b):
+            chave, q = banco.localizar(id_pergunta)
+            print(f"  [{id_pergunta}] {q.pergunta}")
+    print(f"{len(pares)} par(es) com similaridade >= {args.limiar}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import weakref
+from typing import NamedTuple
+
+# Estimativa de tempo por questão: decidir V/F + ler pergunta e justificativa
+SEGUNDOS_POR_QUESTAO = 25
+CARACTERES_POR_SEGUNDO = 15
+
+
+class ResumoTopico(NamedTuple):
+    chave: str
+    menu: str
+    total: int
+    verdadeiras: int
+    falsas: int
+
+
+class ResumoBanco(NamedTuple):
+    versao: object
+    total: int
+    verdadeiras: int
+    falsas: int
+    media_caracteres_pergunta: float
+    media_caracteres_justificativa: float
+    minutos_estimados: tuple  # (mínimo, máximo)
+    topicos: tuple            # ResumoTopico, na ordem do banco
+
+
+class Estatisticas:
+    """Agregados do banco mantidos por soma, para que adicionar questões custe O(1).
+
+    ``resumo()`` só é recalculado depois de alguma alteração; enquanto o banco não
+    muda, a página inicial reaproveita o mesmo ResumoBanco.
+    """
+
+    __slots__ = ("versao", "_menus", "_contagens", "_chars_pergunta", "_chars_justificativa", "_resumo")
+
+    def __init__(self, versao):
+        self.versao = versao
+        self._menus = {}
+        self._contagens = {}  # chave -> [verdadeiras, falsas]
+        self._chars_pergunta = 0
+        self._chars_justificativa = 0
+        self._resumo = None
+
+    def adicionar_topico(self, chave, menu):
+        self._menus.setdefault(chave, menu)
+        self._contagens.setdefault(chave, [0, 0])
+        self._resumo = None
+
+    def adicionar_contagem(self, chave, menu, contagem):
+        """Soma os agregados já prontos de um tópico (ContagemTopico do índice do banco)."""
+        self.adicionar_topico(chave, menu)
+        self._contagens[chave][0] += contagem.verdadeiras
+        self._contagens[chave][1] += contagem.falsas
+        self._chars_pergunta += contagem.caracteres_pergunta
+        self._chars_justificativa += contagem.caracteres_justificativa
+
+    def adicionar_pergunta(self, chave, q, justificativa):
+        contagem = self._contagens.setdefault(chave, [0, 0])
+        contagem[q.resposta_correta != "V"] += 1
+        self._chars_pergunta += len(q.pergunta)
+        self._chars_justificativa += len(justificativa)
+        self._resumo = None
+
+    def resumo(self):
+        if self._resumo is None:
+            self._resumo = self._montar_resumo()
+        return self._resumo
+
+    def _montar_resumo(self):
+        topicos = tuple(ResumoTopico(chave, self._menus.get(chave, chave), v + f, v, f)
+                        for chave, (v, f) in self._contagens.items())
+        total = sum(t.total for t in topicos)
+        divisor = total or 1
+        segundos = total * SEGUNDOS_POR_QUESTAO + \
+            (self._chars_pergunta + self._chars_justificativa) / CARACTERES_POR_SEGUNDO
+        # Faixa de 10 minutos centrada no múltiplo de 5 mais próximo
+        meio = max(5, round(segundos / 60 / 5) * 5)
+        return ResumoBanco(
+            self.versao,
+            total,
+            sum(t.verdadeiras for t in topicos),
+            sum(t.falsas for t in topicos),
+            round(self._chars_pergunta / divisor, 1),
+            round(self._chars_justificativa / divisor, 1),
+            (meio - 5, meio + 5),
+            topicos,
+        )
+
+
+# Os tópicos compilados trazem as contagens no índice e não são lidos; só os de
+# um banco sem elas (editado à mão ou compilado antes delas) têm o conteúdo lido
+def _calcular(banco):
+    estatisticas = Estatisticas(banco.versao)
+    for t in banco.topicos:
+        if t.contagem is not None:
+            estatisticas.adicionar_contagem(t.chave, t.menu, t.contagem)
+            continue
+        estatisticas.adicionar_topico(t.chave, t.menu)
+        justificativas = banco.justificativas(t.chave)
+        for q in banco.perguntas(t.chave):
+            estatisticas.adicionar_pergunta(t.chave, q, justificativas[q.id])
+    return estatisticas
+
+
+# Agregados por banco carregado. A chave é o próprio objeto (não o número da
+# versão, que outro banco pode repetir), por referência fraca para que os
+# números de um banco substituído numa recarga saiam junto com ele
+_por_banco = weakref.WeakKeyDictionary()
+
+
+def estatisticas_banco(banco):
+    estatisticas = _por_banco.get(banco)
+    if estatisticas is None:
+        estatisticas = _por_banco[banco] = _calcular(banco)
+    return estatisticas
@@ -0,0 +1,137 @@
+"""Eventos de resposta gravados em segundo plano, em lotes.
+
+Cada correção gera um Evento que vai para uma fila limitada em memória. Uma
+thread escritora junta os eventos em lotes e os grava em segmentos CSV
+append-only (``eventos/segmento-<pid>-<timestamp>-<n>.csv``) quando o lote
+enche ou quando passa o intervalo máximo. Se a fila estiver cheia, o evento é
+descartado e contado, em vez de travar o rerun do aluno. Um erro de gravação
+(disco cheio, diretório removido) descarta só o lote da vez: a thread avisa,
+conta os eventos perdidos e abre um segmento novo no lote seguinte. Os
+descartes e os erros vão para as métricas (metricas.contar) quando a
+instrumentação está ligada.
+
+Configuração pela variável de ambiente QUIZ_EVENTOS: diretório dos segmentos
+(padrão ``eventos/`` ao lado do app) ou ``desligado``.
+"""
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+import warnings
+from functools import lru_cache
+from typing import NamedTuple
+
+from metricas import contar
+
+DIRETORIO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eventos")
+TAMANHO_FILA = 10_000
+TAMANHO_LOTE = 500
+INTERVALO_FLUSH = 2.0        # segundos
+LINHAS_POR_SEGMENTO = 200_000
+
+
+class Evento(NamedTuple):
+    ts: float
+    sessao: str
+    id_pergunta: str
+    chave_topico: str
+    resposta: str
+    correta: int
+    latencia_ms: int
+
+
+class GravadorEventos:
+    def __init__(self, diretorio, tamanho_fila=TAMANHO_FILA, tamanho_lote=TAMANHO_LOTE,
+                 intervalo=INTERVALO_FLUSH):
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.descartados = 0
+        self.erros_gravacao = 0
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._segmento = 0
+        self._linhas_segmento = LINHAS_POR_SEGMENTO  # força abrir um segmento novo no primeiro lote
+        self._arquivo = None
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, daemon=True, name="quiz-eventos")
+        self._thread.start()
+
+    def registrar(self, evento):
+        """Enfileira sem bloquear; devolve False se o evento foi descartado."""
+        try:
+            self._fila.put_nowait(evento)
+            return True
+        except queue.Full:
+            self.descartados += 1
+            contar("eventos_descartados")
+            return False
+
+    def _executar(self):
+        lote = []
+        limite = time.monotonic() + self.intervalo
+        while not (self._parar.is_set() and self._fila.empty()):
+            try:
+                lote.append(self._fila.get(timeout=max(0.0, limite - time.monotonic())))
+            except queue.Empty:
+                pass
+            if len(lote) >= self.tamanho_lote or time.monotonic() >= limite:
+                if lote:
+                    self._gravar_lote(lote)
+                    lote = []
+                limite = time.monotonic() + self.intervalo
+        if lote:
+            self._gravar_lote(lote)
+        self._fechar_segmento()
+
+    def _gravar_lote(self, lote):
+        # A thread escritora não pode morrer: sem ela a fila enche e todo evento
+        # seguinte seria descartado em silêncio
+        try:
+            self._gravar(lote)
+        except OSError as e:
+            self.erros_gravacao += 1
+            self.descartados += len(lote)
+            contar("eventos_erros_gravacao")
+            contar("eventos_descartados", len(lote))
+            warnings.warn(f"Falha ao gravar {len(lote)} evento(s) em {self.diretorio}: {e}")
+            self._fechar_segmento()
+
+    def _fechar_segmento(self):
+        arquivo, self._arquivo = self._arquivo, None
+        self._linhas_segmento = LINHAS_POR_SEGMENTO  # o próximo lote abre um segmento novo
+        if arquivo is not None:
+            try:
+                arquivo.close()
+            except OSError:
+                pass
+
+    def _gravar(self, lote):
+        if self._linhas_segmento >= LINHAS_POR_SEGMENTO:
+            self._fechar_segmento()
+            self._segmento += 1
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = os.path.join(self.diretorio, f"segmento-{os.getpid()}-{int(time.time())}-{self._segmento}.csv")
+            self._arquivo = open(caminho, "a", newline="", encoding="utf-8")
+            csv.writer(self._arquivo).writerow(Evento._fields)
+            self._linhas_segmento = 0
+        csv.writer(self._arquivo).writerows(lote)
+        self._arquivo.flush()
+        self._linhas_segmento += len(lote)
+
+    def fechar(self, timeout=5.0):
+        self._parar.set()
+        self._thread.join(timeout)
+
+
+@lru_cache(maxsize=None)
+def obter_gravador():
+    """Gravador do processo, ou None se os eventos estiverem desligados."""
+    diretorio = os.environ.get("QUIZ_EVENTOS", DIRETORIO_PADRAO)
+    if diretorio == "desligado":
+        return None
+    gravador = GravadorEventos(diretorio)
+    atexit.register(gravador.fechar)
+    return gravador
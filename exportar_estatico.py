@@ -0,0 +1,201 @@
+"""Exportação estática do quiz: um único HTML com CSS e JS embutidos.
+
+Usa o mesmo banco e os mesmos fragmentos de renderizacao.py que o app
+(cabeçalho da seção, cartões e justificativas), então o resultado tem a mesma
+aparência das seções do Streamlit. A correção e a justificativa são mostradas
+no navegador, e as respostas ficam no localStorage; servir o arquivo custa só
+I/O estático, sem um processo Python por aluno.
+
+Uso:
+    python exportar_estatico.py [--banco DIR] [--saida estatico/index.html]
+"""
+import argparse
+import html
+import json
+import os
+
+from banco_perguntas import CAMINHO_BANCO, carregar_banco
+from estatisticas import estatisticas_banco
+from renderizacao import (DIVISOR_HTML, ESTILO_PAGINA, SECAO_CONCLUIDA_HTML, estatisticas_html,
+                          fragmentos_pagina, justificativa_html)
+
+SAIDA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "estatico", "index.html")
+
+# Complemento do ESTILO_PAGINA para o que o Streamlit fornece pronto
+# (tema escuro, barra lateral, botões e alertas)
+ESTILO_ESTATICO = """
+body { margin: 0; background: #0E1117; color: #FAFAFA;
+       font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }
+.lateral { position: fixed; top: 0; bottom: 0; left: 0; width: 280px; overflow-y: auto;
+           padding: 2rem 1.5rem; box-sizing: border-box; background: #262730; }
+.lateral a { display: block; padding: 6px 0; color: #FAFAFA; text-decoration: none; }
+.lateral a.ativo { font-weight: 600; color: #FF4B4B; }
+.main { margin-left: 280px; }
+.main .block-container { margin: 0 auto; padding-left: 1rem; padding-right: 1rem; }
+.stButton { display: flex; gap: 1rem; }
+.stButton button { flex: 1; cursor: pointer; color: #FAFAFA; background: #0E1117;
+                   border: 1px solid rgba(250,250,250,0.2); font-size: 16px; }
+.stButton button:disabled { cursor: default; opacity: 0.6; transform: none; }
+.alerta { padding: 16px; border-radius: 8px; margin: 16px 0 0 0; }
+.alerta.correta { background: rgba(33,195,84,0.2); color: #DFFDE9; }
+.alerta.incorreta { background: rgba(255,43,43,0.2); color: #FFDEDE; }
+.andamento { font-size: 14px; color: rgba(250,250,250,0.6); }
+.progresso { height: 8px; border-radius: 4px; background: #262730; margin-top: 8px; }
+.progresso div { height: 100%; border-radius: 4px; background: #FF4B4B; }
+@media (max-width: 800px) {
+  .lateral { position: static; width: auto; }
+  .main { margin-left: 0; }
+}
+"""
+
+# Correção no cliente: as respostas corretas vêm no data-r de cada questão. Os ids
+# vêm do enunciado, então as respostas guardadas sobrevivem a uma exportação nova
+SCRIPT = """
+const CHAVE = "quiz-macro-respostas";
+let respostas = {};
+try { respostas = JSON.parse(localStorage.getItem(CHAVE)) || {}; } catch (e) {}
+
+function mostrarResposta(questao, resposta) {
+  const correta = questao.dataset.r;
+  const alerta = questao.querySelector(".alerta");
+  alerta.className = "alerta " + (resposta === correta ? "correta" : "incorreta");
+  alerta.textContent = resposta === correta
+    ? "✅ CORRETO! Muito bem!"
+    : "❌ INCORRETO! A resposta correta é: " + correta;
+  questao.querySelector(".retorno").hidden = false;
+  questao.querySelectorAll("button").forEach(b => b.disabled = true);
+}
+
+function atualizarSecao(secao) {
+  const questoes = secao.querySelectorAll(".questao");
+  let respondidas = 0, acertos = 0;
+  questoes.forEach(q => {
+    const r = respostas[q.dataset.id];
+    if (r) { respondidas++; if (r === q.dataset.r) acertos++; }
+  });
+  const texto = respondidas + "/" + questoes.length + " respondidas · " + acertos + " acertos";
+  secao.querySelectorAll(".andamento").forEach(p => p.textContent = "Seção: " + texto);
+  secao.querySelector(".resumo").textContent = texto;
+  secao.querySelector(".progresso div").style.width = (100 * respondidas / questoes.length) + "%";
+  secao.querySelector(".concluida").hidden = respondidas < questoes.length;
+}
+
+function mostrarPagina() {
+  const alvo = location.hash.slice(1) || "inicio";
+  document.querySelectorAll(".pagina").forEach(p => p.hidden = p.id !== alvo);
+  document.querySelectorAll(".lateral a").forEach(a => a.classList.toggle("ativo", a.hash === "#" + alvo));
+  window.scrollTo(0, 0);
+}
+
+document.addEventListener("click", evento => {
+  const botao = evento.target.closest("button[data-resposta]");
+  if (!botao) return;
+  const questao = botao.closest(".questao");
+  respostas[questao.dataset.id] = botao.dataset.resposta;
+  try { localStorage.setItem(CHAVE, JSON.stringify(respostas)); } catch (e) {}
+  mostrarResposta(questao, botao.dataset.resposta);
+  atualizarSecao(questao.closest(".secao"));
+});
+
+document.querySelectorAll(".questao").forEach(q => {
+  if (respostas[q.dataset.id]) mostrarResposta(q, respostas[q.dataset.id]);
+});
+document.querySelectorAll(".secao").forEach(atualizarSecao);
+window.addEventListener("hashchange", mostrarPagina);
+mostrarPagina();
+"""
+
+
+def questao_html(topico, q, cartao, justificativa):
+    return f"""
+    <div class="questao" data-id="{html.escape(q.id)}" data-r="{q.resposta_correta}">
+        {cartao}
+        <div class="stButton">
+            <button type="button" data-resposta="V">Verdadeiro (V)</button>
+            <button type="button" data-resposta="F">Falso (F)</button>
+        </div>
+        <div class="retorno" hidden>
+            <div class="alerta"></div>
+            {justificativa_html(topico.chave, q, justificativa)}
+            <p class="andamento"></p>
+        </div>
+    </div>"""
+
+
+def secao_html(banco, topico):
+    """Seção completa de um tópico, com os mesmos blocos de criar_secao."""
+    perguntas = banco.perguntas(topico.chave)
+    justificativas = banco.justificativas(topico.chave)
+    blocos = fragmentos_pagina(topico.chave, topico.titulo, topico.descricao, topico.emoji,
+                               perguntas, 0, len(perguntas))
+    questoes = "".join(questao_html(topico, q, cartao, justificativas[q.id])
+                       for q, cartao in zip(perguntas, blocos))
+    return f"""
+    <section id="{html.escape(topico.chave)}" class="pagina secao" hidden>
+        {questoes}
+        {DIVISOR_HTML}
+        <p class="resumo"></p>
+        <div class="progresso"><div></div></div>
+        <div class="concluida" hidden>{SECAO_CONCLUIDA_HTML}</div>
+    </section>"""
+
+
+def exportar(banco):
+    """Devolve o HTML completo do quiz para o banco dado."""
+    links = "".join(f'<a href="#{html.escape(t.chave)}">{t.emoji} {html.escape(t.menu)}</a>'
+                    for t in banco.topicos)
+    secoes = "".join(secao_html(banco, t) for t in banco.topicos)
+    resumo = estatisticas_banco(banco).resumo()
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Quiz de Macroeconomia</title>
+<style>{ESTILO_PAGINA}{ESTILO_ESTATICO}</style>
+</head>
+<body>
+<nav class="lateral">
+    <h1 style="font-size: 24px;">🧠 Quiz para P2 de Macro III</h1>
+    <p>por Bernardo Louzada</p>
+    <hr>
+    <a href="#inicio">Página Inicial</a>
+    {links}
+</nav>
+<main class="main">
+<div class="block-container">
+    <section id="inicio" class="pagina">
+        <div style="text-align: center; padding: 40px 0;">
+            <h1 style="font-size: 48px; color: #F9FAFB; margin-bottom: 20px;">Quiz de revisão para a P2 de Macro</h1>
+            <p style="font-size: 20px; max-width: 800px; margin: 0 auto; color: #4B5563;">
+                por: Bernardo Louzada.
+            </p>
+        </div>
+        {estatisticas_html(resumo)}
+    </section>
+    {secoes}
+</div>
+</main>
+<script>{SCRIPT}</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta o quiz para um HTML estático")
+    parser.add_argument("--banco", default=CAMINHO_BANCO, help="diretório do banco de questões")
+    parser.add_argument("--saida", default=SAIDA_PADRAO, help="arquivo HTML gerado")
+    args = parser.parse_args()
+
+    banco = carregar_banco(args.banco)
+    conteudo = exportar(banco)
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        f.write(conteudo)
+    print(json.dumps({"saida": args.saida, "questoes": banco.total(),
+                      "bytes": len(conteudo.encode("utf-8"))}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,82 +1,484 @@
 import streamlit as st
+import os
 import random
+import time
+import uuid
 from datetime import datetime
 
-
-# Função para exibir pergunta com melhor UI
-def mostrar_pergunta(pergunta, resposta_correta, justificativa, index, total_perguntas):
-    # Cartão com borda e sombra para cada pergunta
+from armazenamento import obter_armazenamento
+from banco_perguntas import obter_banco
+from busca import indice_busca
+from estatisticas import estatisticas_banco
+from eventos import Evento, obter_gravador
+from metricas import medido, medir
+from placar import Placar
+from ranking import INTERVALO_QUADRO, obter_classificacao
+from renderizacao import (DIVISOR_HTML, ESTILO_HTML, ESTILO_LINK_HTML, SECAO_CONCLUIDA_HTML,
+                          cabecalho_secao_html, cartao_html, estatisticas_html, fragmentos_pagina,
+                          justificativa_html, quadro_ranking_html)
+from revisao import Revisao, desserializar_item, serializar_item
+from simulado import indice_amostragem, sortear_simulado
+
+QUESTOES_POR_PAGINA = int(os.environ.get("QUIZ_QUESTOES_POR_PAGINA", "10"))
+TAMANHO_RANKING = 10
+
+
+# Identificador da sessão, guardado na URL (?sessao=...) para que o aluno
+# reencontre suas respostas mesmo se for atendido por outro worker
+def obter_id_sessao():
+    if "id_sessao" not in st.session_state:
+        id_sessao = st.query_params.get("sessao")
+        if not id_sessao:
+            id_sessao = uuid.uuid4().hex
+            st.query_params["sessao"] = id_sessao
+        st.session_state.id_sessao = id_sessao
+    return st.session_state.id_sessao
+
+
+# Placar da sessão (respostas + contagens por tópico), restaurado do backend.
+# É remontado quando o banco muda de versão: respostas de questões que saíram do
+# banco (o id muda junto com o enunciado) deixam de contar, e as gravadas com um
+# id antigo (alias) contam para a questão atual, valendo a resposta mais recente.
+# O id não muda quando só o gabarito é corrigido: a correção é refeita com o banco atual
+def obter_placar():
+    banco = obter_banco()
+    if st.session_state.get("placar_versao") != banco.versao:
+        armazenamento = obter_armazenamento()
+        id_sessao = obter_id_sessao()
+        respostas = {}
+        for id_pergunta, registro in armazenamento.carregar(id_sessao).items():
+            atual = banco.resolver(id_pergunta)
+            if atual is not None and (atual not in respostas or registro.instante > respostas[atual].instante):
+                respostas[atual] = registro
+        for atual, registro in respostas.items():
+            correta = registro.resposta == banco.localizar(atual)[1].resposta_correta
+            respostas[atual] = registro._replace(correta=correta)
+        primeiras = {}
+        for id_pergunta, resposta in armazenamento.carregar_estado(id_sessao, "primeiras").items():
+            primeiras.setdefault(banco.resolver(id_pergunta), resposta)
+        st.session_state.placar = Placar.a_partir_de(respostas, primeiras)
+        st.session_state.placar_versao = banco.versao
+    return st.session_state.placar
+
+
+# Agenda de revisão espaçada da sessão, restaurada do backend. Itens gravados
+# com um id antigo (alias) são regravados uma vez com o id atual
+def obter_revisao():
+    if "revisao" not in st.session_state:
+        armazenamento = obter_armazenamento()
+        id_sessao = obter_id_sessao()
+        itens = armazenamento.carregar_estado(id_sessao, "revisao")
+        aliases = obter_banco().aliases
+        for antigo in [i for i in itens if i in aliases]:
+            valor = itens.pop(antigo)
+            atual = aliases[antigo]
+            if atual not in itens:
+                itens[atual] = valor
+                armazenamento.salvar_estado(id_sessao, "revisao", atual, valor)
+            armazenamento.salvar_estado(id_sessao, "revisao", antigo, None)
+        st.session_state.revisao = Revisao({i: desserializar_item(v) for i, v in itens.items()})
+    return st.session_state.revisao
+
+
+# Nome exibido no ranking: o apelido escolhido pelo aluno ou um anônimo derivado da sessão
+def nome_no_ranking():
+    return st.session_state.get("apelido", "").strip() or f"Anônimo {obter_id_sessao()[:4]}"
+
+
+@medido("correcao")
+def registrar_resposta(chave_topico, q, resposta, latencia_ms=0):
+    armazenamento = obter_armazenamento()
+    id_sessao = obter_id_sessao()
+    placar = obter_placar()
+    primeira = placar.resposta(q.id) is None
+    registro = placar.registrar(chave_topico, q, resposta)
+    armazenamento.salvar(id_sessao, q.id, registro)
+    if primeira:
+        armazenamento.salvar_estado(id_sessao, "primeiras", q.id, resposta)
+
+    # Ranking da turma: atualização O(log n), serializada dentro da Classificacao.
+    # Conta só a primeira tentativa de cada questão; trocar a resposta depois da
+    # correção não muda a pontuação
+    classificacao = obter_classificacao()
+    if classificacao is not None and primeira:
+        classificacao.registrar(id_sessao, nome_no_ranking(), chave_topico,
+                                placar.acertos_de_primeira(chave_topico), placar.acertos_de_primeira(),
+                                registro.instante.timestamp())
+
+    # Evento para análise: só enfileira, a gravação é feita em lote por outra thread
+    gravador = obter_gravador()
+    if gravador is not None:
+        gravador.registrar(Evento(registro.instante.timestamp(), id_sessao, q.id, chave_topico,
+                                  resposta, int(registro.correta), latencia_ms))
+
+    # Só grava a agenda quando a questão entra, muda ou sai da revisão
+    revisao = obter_revisao()
+    agendada = q.id in revisao.itens
+    item = revisao.registrar(q.id, registro.correta, registro.instante.timestamp())
+    if item is not None or agendada:
+        armazenamento.salvar_estado(id_sessao, "revisao", q.id, item and serializar_item(item))
+    return registro
+
+
+# Função para exibir pergunta com melhor UI.
+# Cada cartão é um fragmento: clicar em V/F reexecuta e reenvia só este cartão,
+# e não a página inteira.
+# Com ``escopo`` (simulado, revisão) o cartão mostra só as respostas dadas naquele
+# escopo, em vez da última resposta do placar, e usa chaves próprias nos botões.
+@st.fragment
+@medido("mostrar_pergunta")
+def mostrar_pergunta(chave_topico, q, cartao_html, total_perguntas=None, escopo=None):
+    chave_botao = f"{escopo}_{q.id}" if escopo else q.id
+    # Um rerun do fragmento repete os argumentos da última execução completa:
+    # se o banco foi recarregado nesse meio-tempo, ``q`` pode ter saído do banco
+    # ou mudado de gabarito. Nada é corrigido; a página é remontada com o banco novo
+    banco = obter_banco()
+    if q.id not in banco or banco.localizar(q.id)[1] != q:
+        st.session_state.get(f"respostas_{escopo}", {}).pop(q.id, None)
+        st.session_state.get("exibida_em", {}).pop(chave_botao, None)
+        st.rerun()
+    # Cartão (com cabeçalho/divisor anteriores) já pré-renderizado em um único bloco
     with st.container():
-        st.markdown(f"""
-        <div style="padding: 20px; border-radius: 10px; background-color: #1E293B; 
-                    box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 20px;">
-            <h4 style="color: #F9FAFB; margin-bottom: 15px;">Questão {index}/{total_perguntas}</h4>
-            <p style="font-size: 16px; margin-bottom: 20px;">{pergunta}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(cartao_html, unsafe_allow_html=True)
 
         # Botões mais atrativos para as respostas
         col1, col2 = st.columns(2)
         with col1:
-            verdadeiro = st.button("Verdadeiro (V)", key=f"V_{index}",
+            verdadeiro = st.button("Verdadeiro (V)", key=f"V_{chave_botao}",
                                    use_container_width=True,
                                    type="secondary")  # Always use secondary type initially
         with col2:
-            falso = st.button("Falso (F)", key=f"F_{index}",
+            falso = st.button("Falso (F)", key=f"F_{chave_botao}",
                               use_container_width=True,
                               type="secondary")  # Always use secondary type initially
 
-        # Verificar resposta quando o usuário clicar
-        resposta_usuario = None
-        if verdadeiro:
-            resposta_usuario = "V"
-        elif falso:
-            resposta_usuario = "F"
-
-        if resposta_usuario is not None:
-            if resposta_usuario == resposta_correta:
+        # Verificar resposta quando o usuário clicar; a resposta fica registrada no
+        # placar da sessão para sobreviver aos próximos reruns (o botão só é True uma vez)
+        placar = obter_placar()
+        respostas_escopo = st.session_state.setdefault(f"respostas_{escopo}", {}) if escopo else None
+        # Momento em que o cartão apareceu, para medir quanto o aluno levou para responder
+        exibida_em = st.session_state.setdefault("exibida_em", {})
+        if verdadeiro or falso:
+            inicio = exibida_em.pop(chave_botao, None)
+            latencia_ms = int((time.monotonic() - inicio) * 1000) if inicio is not None else 0
+            registro = registrar_resposta(chave_topico, q, "V" if verdadeiro else "F", latencia_ms)
+            if escopo:
+                respostas_escopo[q.id] = registro
+        registro = respostas_escopo.get(q.id) if escopo else placar.resposta(q.id)
+        if registro is None:
+            exibida_em.setdefault(chave_botao, time.monotonic())
+
+        if registro is not None:
+            if registro.correta:
                 st.success("✅ CORRETO! Muito bem!")
             else:
-                st.error(f"❌ INCORRETO! A resposta correta é: {resposta_correta}")
-
-            # Justificativa com estilo melhorado
-            st.markdown(f"""
-            <div style="padding: 15px; border-left: 4px solid #F9FAFB; 
-                        background-color: black; margin: 10px 0px 20px 0px;">
-                <strong>Justificativa:</strong> {justificativa}
-            </div>
-            """, unsafe_allow_html=True)
-
-    # Divisor visualmente mais atraente
-    st.markdown("<hr style='margin: 30px 0; border: none; height: 1px; background-color: #E5E7EB;'>",
-                unsafe_allow_html=True)
-
-
-# Função para criar seção de tópico
-def criar_secao(titulo, descricao, perguntas, emoji):
-    # Cabeçalho de seção com melhor estilo e ícone
-    st.markdown(f"""
-    <div style="display: flex; align-items: center; margin: 30px 0 20px 0;">
-        <div style="font-size: 30px; margin-right: 15px;">{emoji}</div>
-        <h2 style="margin: 0; color: #F9FAFB;">{titulo}</h2>
-    </div>
-    <p style="margin-bottom: 25px; color: #4B5563;">{descricao}</p>
-    """, unsafe_allow_html=True)
-
-    # Contador de acertos para esta seção
-    acertos = 0
+                st.error(f"❌ INCORRETO! A resposta correta é: {q.resposta_correta}")
+
+            # Justificativa com estilo melhorado (o arquivo de justificativas do
+            # tópico só é lido quando alguma questão é respondida)
+            justificativa = banco.justificativa(chave_topico, q.id)
+            if justificativa is not None:
+                st.markdown(justificativa_html(chave_topico, q, justificativa), unsafe_allow_html=True)
+
+            # Como só o cartão é reexecutado, o andamento da seção aparece aqui;
+            # a barra de progresso no fim da página é atualizada no próximo rerun completo
+            if total_perguntas is not None:
+                respondidas, acertos = placar.contagem(chave_topico)
+                st.caption(f"Seção: {respondidas}/{total_perguntas} respondidas · {acertos} acertos")
+
+
+def mudar_pagina(chave_estado, delta):
+    st.session_state[chave_estado] += delta
+
+
+# Navegação entre páginas da seção (setas do teclado também funcionam)
+def navegacao_paginas(chave_topico, pagina, paginas, posicao):
+    chave_estado = f"pagina_{chave_topico}"
+    col1, col2, col3 = st.columns([1, 2, 1], vertical_alignment="center")
+    with col1:
+        st.button("⬅️ Anterior", key=f"anterior_{posicao}_{chave_topico}", disabled=pagina == 0,
+                  on_click=mudar_pagina, args=(chave_estado, -1), use_container_width=True,
+                  shortcut="Left" if posicao == "fim" else None)
+    with col2:
+        st.markdown(f"<p style='text-align: center; margin: 0;'>Página {pagina + 1} de {paginas}</p>",
+                    unsafe_allow_html=True)
+    with col3:
+        st.button("Próxima ➡️", key=f"proxima_{posicao}_{chave_topico}", disabled=pagina == paginas - 1,
+                  on_click=mudar_pagina, args=(chave_estado, 1), use_container_width=True,
+                  shortcut="Right" if posicao == "fim" else None)
+
+
+# Função para criar seção de tópico.
+# As questões são mostradas em páginas de QUESTOES_POR_PAGINA, para que o número
+# de widgets por rerun não cresça com o tamanho do tópico.
+@medido("criar_secao")
+def criar_secao(chave_topico, titulo, descricao, perguntas, emoji):
     total = len(perguntas)
+    paginas = max(1, -(-total // QUESTOES_POR_PAGINA))
+    chave_estado = f"pagina_{chave_topico}"
+    pagina = min(max(st.session_state.get(chave_estado, 0), 0), paginas - 1)
+    st.session_state[chave_estado] = pagina
+    inicio = pagina * QUESTOES_POR_PAGINA
+    fim = min(inicio + QUESTOES_POR_PAGINA, total)
 
-    # Exibir perguntas
-    for i, q in enumerate(perguntas):
-        mostrar_pergunta(q["pergunta"], q["resposta_correta"], q["justificativa"], i + 1, total)
-
-    # Barra de progresso
-    st.progress(1.0)
-    st.markdown(f"<p style='text-align: right;'>Seção concluída!</p>", unsafe_allow_html=True)
+    if paginas > 1:
+        navegacao_paginas(chave_topico, pagina, paginas, "topo")
 
+    # Cabeçalho da seção e cartões da página montados uma vez por processo (ver renderizacao.py)
+    blocos = fragmentos_pagina(chave_topico, titulo, descricao, emoji, perguntas, inicio, fim)
 
-def main():
+    # Exibir perguntas
+    for q, cartao in zip(perguntas[inicio:fim], blocos):
+        mostrar_pergunta(chave_topico, q, cartao, total)
+
+    # Divisor da última questão + navegação + barra de progresso com as contagens do placar
+    st.markdown(DIVISOR_HTML, unsafe_allow_html=True)
+    if paginas > 1:
+        navegacao_paginas(chave_topico, pagina, paginas, "fim")
+    respondidas, acertos = obter_placar().contagem(chave_topico)
+    st.progress(respondidas / total if total else 1.0,
+                text=f"{respondidas}/{total} respondidas · {acertos} acertos")
+    if total and respondidas == total:
+        st.markdown(SECAO_CONCLUIDA_HTML, unsafe_allow_html=True)
+
+
+# Aviso de quase duplicatas (pares detectados por compilar_banco.py/duplicatas.py)
+def avisar_parecidas(banco, q):
+    parecidas = []
+    for id_outra, similaridade in banco.similares(q.id):
+        chave_outra, outra = banco.localizar(id_outra)
+        enunciado = outra.pergunta if len(outra.pergunta) <= 80 else outra.pergunta[:77] + "..."
+        parecidas.append(f"{banco.topico(chave_outra).menu}: “{enunciado}” ({similaridade:.0%})")
+    if parecidas:
+        st.caption("⚠️ Parecida com " + " · ".join(parecidas))
+
+
+def novo_simulado():
+    st.session_state.semente_simulado = random.randrange(1_000_000)
+
+
+def guardar_simulado():
+    st.session_state.semente_simulado = st.session_state.campo_semente
+    st.session_state.quantidade_simulado = st.session_state.campo_quantidade
+
+
+# Simulado: questões de todos os tópicos sorteadas a partir de uma semente
+@medido("criar_simulado")
+def criar_simulado(banco):
+    st.markdown(cabecalho_secao_html(
+        "simulado", "Simulado",
+        "Questões sorteadas de todos os tópicos. Use a mesma semente para refazer o mesmo simulado.",
+        "🎲"), unsafe_allow_html=True)
+
+    if "semente_simulado" not in st.session_state:
+        novo_simulado()
+    total_banco = banco.total()
+    # O estado dos widgets some quando a página sai de cena; semente e tamanho ficam em chaves próprias
+    st.session_state.campo_semente = st.session_state.semente_simulado
+    st.session_state.campo_quantidade = min(st.session_state.get("quantidade_simulado", 40), total_banco)
+
+    col1, col2, col3 = st.columns([2, 2, 1], vertical_alignment="bottom")
+    with col1:
+        semente = st.number_input("Semente", min_value=0, step=1, key="campo_semente",
+                                  on_change=guardar_simulado)
+    with col2:
+        quantidade = st.number_input("Número de questões", min_value=1, max_value=total_banco, step=5,
+                                     key="campo_quantidade", on_change=guardar_simulado)
+    with col3:
+        st.button("🎲 Novo simulado", on_click=novo_simulado, use_container_width=True)
+
+    # O sorteio só é refeito quando a semente, o tamanho ou a versão do banco mudam
+    chave = (int(semente), int(quantidade), banco.versao)
+    if st.session_state.get("simulado_chave") != chave:
+        sorteio = sortear_simulado(indice_amostragem(banco), int(quantidade), int(semente))
+        st.session_state.simulado = tuple((chave_topico, banco.perguntas(chave_topico)[posicao])
+                                          for chave_topico, posicao in sorteio)
+        st.session_state.simulado_chave = chave
+        st.session_state.respostas_simulado = {}
+        st.session_state.pagina_simulado = 0
+    perguntas = st.session_state.simulado
+
+    # Em páginas de QUESTOES_POR_PAGINA, como as seções dos tópicos
+    total = len(perguntas)
+    paginas = max(1, -(-total // QUESTOES_POR_PAGINA))
+    pagina = min(max(st.session_state.get("pagina_simulado", 0), 0), paginas - 1)
+    st.session_state.pagina_simulado = pagina
+    inicio = pagina * QUESTOES_POR_PAGINA
+    if paginas > 1:
+        navegacao_paginas("simulado", pagina, paginas, "topo")
+
+    prefixo = ""
+    for i, (chave_topico, q) in enumerate(perguntas[inicio:inicio + QUESTOES_POR_PAGINA], inicio):
+        mostrar_pergunta(chave_topico, q, prefixo + cartao_html(chave_topico, q, i + 1, total),
+                         escopo="simulado")
+        avisar_parecidas(banco, q)
+        prefixo = DIVISOR_HTML
+
+    st.markdown(DIVISOR_HTML, unsafe_allow_html=True)
+    if paginas > 1:
+        navegacao_paginas("simulado", pagina, paginas, "fim")
+    respostas = st.session_state.respostas_simulado.values()
+    respondidas = len(respostas)
+    acertos = sum(r.correta for r in respostas)
+    st.progress(respondidas / total if total else 1.0,
+                text=f"{respondidas}/{total} respondidas · {acertos} acertos")
+
+
+def proxima_revisao():
+    st.session_state.revisao_atual = None
+
+
+# Revisão espaçada: uma questão por vez, a que venceu há mais tempo na agenda
+@medido("criar_revisao")
+def criar_revisao(banco):
+    st.markdown(cabecalho_secao_html(
+        "revisao", "Revisão",
+        "As questões que você errou voltam aqui em intervalos crescentes até serem acertadas várias vezes.",
+        "🔁"), unsafe_allow_html=True)
+
+    revisao = obter_revisao()
+    atual = st.session_state.get("revisao_atual")
+    if atual is None or atual not in banco:
+        id_pergunta = revisao.proxima()
+        # Ignora questões que não existem mais no banco
+        while id_pergunta is not None and id_pergunta not in banco:
+            del revisao.itens[id_pergunta]
+            obter_armazenamento().salvar_estado(obter_id_sessao(), "revisao", id_pergunta, None)
+            id_pergunta = revisao.proxima()
+        st.session_state.revisao_atual = id_pergunta
+        st.session_state.respostas_revisao = {}
+
+    id_pergunta = st.session_state.revisao_atual
+    if id_pergunta is None:
+        vencimento = revisao.proximo_vencimento()
+        if vencimento is None:
+            st.info("Nenhuma questão para revisar. Erre algumas nos tópicos e volte aqui! 😉")
+        else:
+            quando = datetime.fromtimestamp(vencimento).strftime("%d/%m %H:%M")
+            st.info(f"Nada vencido agora. Próxima revisão em {quando}.")
+        st.button("🔄 Verificar de novo", on_click=proxima_revisao)
+        return
+
+    chave_topico, q = banco.localizar(id_pergunta)
+    st.caption(f"{len(revisao)} questão(ões) na agenda de revisão")
+    mostrar_pergunta(chave_topico, q, cartao_html(chave_topico, q, 1, 1), escopo="revisao")
+    avisar_parecidas(banco, q)
+    st.button("Próxima questão ➡️", on_click=proxima_revisao)
+
+
+def renomear_no_ranking():
+    st.session_state.apelido = st.session_state.campo_apelido
+    classificacao = obter_classificacao()
+    if classificacao is not None:
+        classificacao.renomear(obter_id_sessao(), nome_no_ranking())
+
+
+# Quadro do ranking: fragmento que se atualiza sozinho; os números vêm de um
+# quadro compartilhado entre as sessões e recalculado a cada INTERVALO_QUADRO
+@st.fragment(run_every=INTERVALO_QUADRO)
+def quadro_ranking(chave_topico):
+    classificacao = obter_classificacao()
+    quadro = classificacao.quadro(chave_topico, TAMANHO_RANKING)
+    if not quadro.primeiros:
+        st.info("Ninguém pontuou aqui ainda. Responda algumas questões para entrar no ranking!")
+        return
+
+    id_sessao = obter_id_sessao()
+    # HTML em vez de st.table, que puxaria pandas/pyarrow para o processo
+    st.markdown(quadro_ranking_html(quadro, id_sessao), unsafe_allow_html=True)
+    posicao, participantes = classificacao.posicao(id_sessao, chave_topico)
+    hora = datetime.fromtimestamp(quadro.gerado_em).strftime("%H:%M:%S")
+    if posicao is None:
+        st.caption(f"{participantes} participante(s) · atualizado às {hora}")
+    else:
+        st.caption(f"Sua posição: {posicao}º de {participantes} · atualizado às {hora}")
+
+
+# Ranking da turma, geral e por tópico
+@medido("criar_ranking")
+def criar_ranking(banco):
+    st.markdown(cabecalho_secao_html(
+        "ranking", "Ranking",
+        "Quem mais acertou na turma. A pontuação conta a primeira resposta de cada questão.",
+        "🏆"), unsafe_allow_html=True)
+
+    if obter_classificacao() is None:
+        st.info("O ranking da turma não está disponível: com vários workers ele precisa do backend redis "
+                "(QUIZ_BACKEND=redis://...) para reunir os alunos de todos os processos.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        # O estado de um widget some quando a página sai de cena; o apelido fica guardado em "apelido"
+        st.session_state.campo_apelido = st.session_state.get("apelido", "")
+        st.text_input("Seu apelido no ranking", key="campo_apelido", max_chars=30,
+                      placeholder=nome_no_ranking(), on_change=renomear_no_ranking)
+    with col2:
+        opcoes = {"Geral": None} | {t.menu: t.chave for t in banco.topicos}
+        escolha = st.selectbox("Ranking", list(opcoes))
+    quadro_ranking(opcoes[escolha])
+
+
+# Página de administração: só aparece com ?admin=<QUIZ_ADMIN_SENHA> na URL
+def admin_liberado():
+    senha = os.environ.get("QUIZ_ADMIN_SENHA")
+    return bool(senha) and st.query_params.get("admin") == senha
+
+
+@st.cache_data(ttl=60, show_spinner="Analisando o log de respostas...")
+def analise_itens_em_cache():
+    # Import tardio: pandas/numpy só são necessários nesta página
+    from analise_itens import analisar, carregar_eventos, resumo_por_topico
+    itens = analisar(carregar_eventos(aliases=obter_banco().aliases))
+    return itens, resumo_por_topico(itens)
+
+
+def criar_admin(banco):
+    st.markdown(cabecalho_secao_html(
+        "admin", "Análise de Itens",
+        "Dificuldade, discriminação, ponto-bisserial e distratores calculados a partir do log de respostas.",
+        "🛠️"), unsafe_allow_html=True)
+
+    itens, resumo = analise_itens_em_cache()
+    if itens.empty:
+        st.info("Ainda não há respostas registradas no log de eventos.")
+        return
+
+    st.subheader("Por tópico")
+    st.dataframe(resumo, use_container_width=True)
+
+    st.subheader("Por questão")
+    itens = itens.assign(pergunta=itens["id_pergunta"].map(
+        lambda i: banco.localizar(i)[1].pergunta if i in banco else ""))
+    for t in banco.topicos:
+        do_topico = itens[itens["chave_topico"] == t.chave]
+        if len(do_topico):
+            with st.expander(f"{t.emoji} {t.menu} ({len(do_topico)} questões)"):
+                st.dataframe(do_topico.drop(columns="chave_topico"), hide_index=True, use_container_width=True)
+
+
+# Busca nas perguntas e justificativas (índice invertido montado uma vez por
+# processo). É um fragmento: digitar uma consulta reexecuta só a busca, não a
+# página aberta no conteúdo principal
+@st.fragment
+def busca_lateral():
+    banco = obter_banco()
+    st.subheader("🔎 Buscar questões")
+    consulta = st.text_input("Buscar questões", placeholder="ex.: oferta de Lucas, custos de menu",
+                             label_visibility="collapsed")
+    if consulta:
+        resultados = indice_busca(banco).buscar(consulta, limite=8)
+        if resultados:
+            st.markdown("\n".join(
+                f"- **{banco.topico(r.chave_topico).menu} · Questão {r.posicao}**: "
+                f"{banco.perguntas(r.chave_topico)[r.posicao - 1].pergunta}"
+                for r in resultados))
+        else:
+            st.caption("Nenhuma questão encontrada.")
+
+
+# Configuração da página e CSS, enviados no início de todo rerun completo
+def configurar_pagina():
     # Configuração da página com tema consistente
     st.set_page_config(
         page_title="Quiz de Macroeconomia",
@@ -85,32 +487,22 @@ def main():
         initial_sidebar_state="expanded"
     )
 
-    # CSS personalizado para melhorar a aparência geral
-    st.markdown("""
-    <style>
-    .stButton button {
-        border-radius: 8px;
-        padding: 10px 15px;
-        font-weight: 500;
-        transition: all 0.3s;
-    }
-    .stButton button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-    }
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-        max-width: 1000px;
-    }
-    h1, h2, h3, h4, h5, h6 {
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }
-    .css-1aumxhk {
-        background-color: #F9FAFB;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # CSS personalizado para melhorar a aparência geral: servido como arquivo
+    # estático e baixado uma vez pelo navegador. Sem o servidor de estáticos, vai
+    # inline (só <style>, que o st.html coloca fora do layout da página)
+    if st.get_option("server.enableStaticServing"):
+        st.html(ESTILO_LINK_HTML, unsafe_allow_javascript=True)
+    else:
+        st.html(ESTILO_HTML)
+
+
+def main():
+    with medir("configuracao_pagina"):
+        configurar_pagina()
+
+    # Banco de questões carregado uma vez por processo e compartilhado entre sessões
+    with medir("banco"):
+        banco = obter_banco()
 
     # Barra lateral com instruções e estatísticas
     with st.sidebar:
@@ -133,280 +525,23 @@ def main():
 
         # Menu de navegação
         st.subheader("🧭 Navegação")
-        menu = st.radio(
-            "Selecione um tópico:",
-            ["Página Inicial",
-             "Kalecki",
-             "Teoria das Expectativas Racionais",
-             "Ciclos Reais de Negócios",
-             "Modelos Novo-Keynesianos",
-             "Mercado de Trabalho e Assimetrias"]
-        )
-
-    # Carrega as perguntas (mantendo as mesmas do código original)
-    perguntas_TER = [
-        # Do primeiro PDF – questões sobre TER (Q3 e Q4)
-        {
-            "pergunta": "Na TER, um choque monetário não modifica de forma permanente a oferta real.",
-            "resposta_correta": "V",
-            "justificativa": "Os choques monetários têm efeitos temporários, pois os agentes ajustam rapidamente suas expectativas."
-        },
-        {
-            "pergunta": "Na função de oferta de Lucas, se o preço atual excede o preço esperado, a oferta real supera a oferta prevista.",
-            "resposta_correta": "V",
-            "justificativa": "Conforme Lucas, pt > p̂ implica que Y > Ŷ."
-        },
-        {
-            "pergunta": "Na TER, o governo ajusta sua política monetária de acordo com o grau de realização das expectativas.",
-            "resposta_correta": "F",
-            "justificativa": "Os agentes já incorporam todas as informações disponíveis, tornando ineficaz a modificação da política com base em expectativas."
-        },
-        {
-            "pergunta": "Na TER, o ciclo econômico não pode ser cumulativo.",
-            "resposta_correta": "V",
-            "justificativa": "Ciclos ocorrem a partir de choques exógenos e os ajustes das expectativas evitam processos cumulativos."
-        },
-        {
-            "pergunta": "As curvas de Phillips na TER não se restringem apenas ao curto prazo.",
-            "resposta_correta": "F",
-            "justificativa": "A curva de Phillips é considerada vertical tanto no curto quanto no longo prazo na TER."
-        },
-        {
-            "pergunta": "O ciclo econômico na TER se explica exclusivamente por choques monetários.",
-            "resposta_correta": "F",
-            "justificativa": "Choques reais, como tecnológicos, também são determinantes para o ciclo econômico."
-        },
-        {
-            "pergunta": "A Teoria das Expectativas Racionais não considera a existência de custos de ajuste na economia, o que limita sua capacidade de explicar certas flutuações econômicas.",
-            "resposta_correta": "V",
-            "justificativa": "A TER assume ajustes instantâneos, desconsiderando custos de mudança de preços e rigidez salarial."
-        },
-        # Do segundo PDF – conjunto 1
-        {
-            "pergunta": "Agentes formam suas expectativas utilizando todas as informações disponíveis, inclusive o modelo econômico vigente.",
-            "resposta_correta": "V",
-            "justificativa": "A TER parte do pressuposto de que os agentes são racionais e utilizam todo o conhecimento disponível."
-        },
-        {
-            "pergunta": "Políticas monetárias e fiscais são sempre eficazes no curto prazo, pois os agentes não antecipam seus efeitos.",
-            "resposta_correta": "F",
-            "justificativa": "Os agentes antecipam os efeitos, o que torna essas políticas ineficazes tanto no curto quanto no longo prazo."
-        },
-        {
-            "pergunta": "A curva de Phillips, segundo a TER, é vertical no curto e longo prazo.",
-            "resposta_correta": "V",
-            "justificativa": "Isso demonstra a ausência de trade-off entre inflação e desemprego na abordagem de expectativas racionais."
-        },
-        # Do segundo PDF – conjunto 2 (Crítica ao Keynesianismo)
-        {
-            "pergunta": "Políticas econômicas sistemáticas são ineficazes, pois os agentes ajustam antecipadamente suas expectativas.",
-            "resposta_correta": "V",
-            "justificativa": "A antecipação dos agentes neutraliza os efeitos de políticas sistemáticas."
-        },
-        {
-            "pergunta": "A crítica da TER ao keynesianismo defende que choques de demanda agregada explicam flutuações persistentes.",
-            "resposta_correta": "F",
-            "justificativa": "A TER enfatiza que choques reais, e não apenas de demanda, explicam as flutuações econômicas."
-        },
-        {
-            "pergunta": "A TER defende que modelos macroeconômicos devem incorporar microfundamentos, como o comportamento otimizador dos agentes.",
-            "resposta_correta": "V",
-            "justificativa": "Integrar microfundamentos é crucial para uma análise mais consistente do comportamento dos agentes."
-        },
-        # Do segundo PDF – conjunto 3 (Hipóteses do Modelo de Expectativas Racionais)
-        {
-            "pergunta": "Os agentes utilizam toda a informação disponível para formar expectativas, sem acesso a informações futuras.",
-            "resposta_correta": "V",
-            "justificativa": "Essa é uma hipótese central da TER."
-        },
-        {
-            "pergunta": "O modelo assume que os erros de previsão são sempre nulos, já que os agentes possuem informações perfeitas.",
-            "resposta_correta": "F",
-            "justificativa": "Erros de previsão ocorrem e são considerados ruído branco no modelo."
-        },
-        {
-            "pergunta": "Políticas econômicas não sistemáticas podem ter efeitos temporários sobre o produto e o emprego.",
-            "resposta_correta": "V",
-            "justificativa": "Políticas inesperadas podem surpreender os agentes e gerar efeitos transitórios antes do ajuste completo das expectativas."
-        }
-    ]
-
-    perguntas_kalecki = [
-        {
-            "pergunta": "Kalecki chegou a resultados muito próximos de Keynes, incluindo a rejeição da Lei de Say.",
-            "resposta_correta": "V",
-            "justificativa": "Tanto Kalecki quanto Keynes refutam a Lei de Say, pois enfatizam a primazia dos gastos sobre os lucros na determinação da atividade econômica."
-        },
-        {
-            "pergunta": "Para Kalecki, o preço de uma mercadoria é determinado pela interação entre oferta e demanda no mercado.",
-            "resposta_correta": "F",
-            "justificativa": "Kalecki, inspirado em Keynes e Marx, defende que os preços seguem uma lógica de mark-up, onde os empresários aplicam uma margem de lucro sobre os custos, e não pela interação direta de oferta e demanda."
-        },
-        {
-            "pergunta": "Kalecki contesta a Lei do Custo Marginal Crescente, argumentando que o custo marginal é sempre crescente à medida que a produção aumenta.",
-            "resposta_correta": "F",
-            "justificativa": "Kalecki argumenta que, enquanto a capacidade produtiva não for plenamente utilizada, o custo marginal será decrescente, tornando-se crescente apenas quando a produção atinge sua capacidade máxima."
-        },
-        {
-            "pergunta": "Na teoria de Kalecki, os lucros das empresas são determinados pelos gastos dos capitalistas e não o contrário.",
-            "resposta_correta": "V",
-            "justificativa": "Kalecki mostra que os gastos dos capitalistas, via investimento e consumo, determinam os lucros, refutando a visão neoclássica de que os lucros determinam os gastos."
-        },
-        {
-            "pergunta": "Kalecki adota a teoria neoclássica da taxa natural de juros como fator de equilíbrio da economia.",
-            "resposta_correta": "F",
-            "justificativa": "Kalecki rejeita a teoria da taxa natural de juros, argumentando que o equilíbrio entre poupança e investimento ocorre independentemente da taxa de juros, sendo determinado pelas variações da renda."
-        },
-        {
-            "pergunta": "A mecânica do multiplicador de Kalecki é idêntica à de Keynes, sem nenhuma diferença conceitual.",
-            "resposta_correta": "F",
-            "justificativa": "Embora semelhantes, o multiplicador de Kalecki difere de Keynes ao considerar o consumo dos capitalistas como fator determinante do emprego total, além de dar maior ênfase à distribuição de renda."
-        },
-        {
-            "pergunta": "Para Kalecki, o déficit orçamentário do governo pode aumentar os lucros dos capitalistas.",
-            "resposta_correta": "V",
-            "justificativa": "Kalecki argumenta que um aumento nos gastos do governo eleva os lucros dos capitalistas acima do nível determinado pelo investimento privado e consumo dos capitalistas."
-        }
-    ]
-
-    perguntas_ciclos = [
-        {
-            "pergunta": "Os ciclos econômicos na Teoria dos Ciclos Reais são causados principalmente por choques monetários.",
-            "resposta_correta": "F",
-            "justificativa": "Os modelos apontam choques reais, como inovações tecnológicas, como principais motores dos ciclos."
-        },
-        {
-            "pergunta": "Um choque de produtividade positivo temporário leva a um aumento do salário e, devido ao efeito substituição, a um acréscimo na oferta de trabalho.",
-            "resposta_correta": "V",
-            "justificativa": "Quando ocorre um choque positivo de produtividade temporário, ele aumenta a eficiência do trabalho, elevando a produtividade marginal do trabalho. O efeito substituição prevalece sobre o efeito renda, levando os trabalhadores a ofertarem mais trabalho. Isso acontece porque o trabalho se torna relativamente mais atrativo em relação ao lazer, aumentando a oferta de trabalho."
-        },
-        {
-            "pergunta": "Na Teoria dos Ciclos Reais, o ciclo econômico reflete a manutenção das condições de maximização dos agentes.",
-            "resposta_correta": "V",
-            "justificativa": "Os agentes respondem a choques exógenos de forma a manter suas condições de maximização."
-        },
-        {
-            "pergunta": "Nos modelos RBC, os ciclos são causados exclusivamente por choques de demanda agregada.",
-            "resposta_correta": "F",
-            "justificativa": "Os modelos RBC enfatizam choques reais, não apenas de demanda, como fonte dos ciclos."
-        },
-        {
-            "pergunta": "Um aumento na produtividade gera, de forma temporária, elevação no emprego e no produto nos modelos RBC.",
-            "resposta_correta": "V",
-            "justificativa": "Choques de produtividade têm efeitos positivos transitórios sobre a economia."
-        },
-        {
-            "pergunta": "A flexibilidade de salários e preços nos modelos RBC garante o ajuste rápido dos mercados.",
-            "resposta_correta": "V",
-            "justificativa": "Essa flexibilidade elimina desequilíbrios, promovendo ajustes eficientes."
-        },
-        {
-            "pergunta": "Nos Modelos de Ciclos Reais, um choque negativo de produtividade reduz temporariamente o emprego, mas não afeta o produto de longo prazo.",
-            "resposta_correta": "F",
-            "justificativa": "A redução da produtividade pode afetar o crescimento do capital e do trabalho, impactando o produto no longo prazo."
-        }
-    ]
-
-    perguntas_nk = [
-        {
-            "pergunta": "No caso da análise microeconômica de Mankiw (duopólio), o ótimo é alcançado mesmo com preços parcialmente rígidos.",
-            "resposta_correta": "F",
-            "justificativa": "A rigidez de preços gera falhas de coordenação e conduz a resultados subótimos."
-        },
-        {
-            "pergunta": "As falhas de coordenação no mercado decorrem de externalidades de demanda entre as empresas.",
-            "resposta_correta": "V",
-            "justificativa": "Decisões interdependentes podem gerar externalidades que afetam a eficiência do mercado."
-        },
-        {
-            "pergunta": "Os efeitos da recessão são integralmente compensados somente quando os preços são totalmente flexíveis.",
-            "resposta_correta": "V",
-            "justificativa": "Em modelos de equilíbrio geral com preços flexíveis, os choques que levam a recessões podem ser rapidamente ajustados pelo próprio mercado. No entanto, em economias com preços rígidos (como nos modelos keynesianos), os efeitos da recessão podem persistir, pois os preços e salários não se ajustam rapidamente, resultando em desemprego e capacidade ociosa."
-        },
-        {
-            "pergunta": "No modelo de Mankiw, a rigidez dos preços é explicada pelos custos de cardápio (menu costs).",
-            "resposta_correta": "V",
-            "justificativa": "Os custos associados à mudança de preços explicam a rigidez observada."
-        },
-        {
-            "pergunta": "A histerese no mercado de trabalho implica que choques temporários podem ter efeitos permanentes sobre o emprego.",
-            "resposta_correta": "V",
-            "justificativa": "Choques podem alterar a dinâmica do mercado de trabalho de forma duradoura."
-        },
-        {
-            "pergunta": "Akerlof, Grossman e Stiglitz defendem que a qualidade dos bens pode variar independentemente do preço, refutando o postulado de homogeneidade.",
-            "resposta_correta": "V",
-            "justificativa": "Em mercados com assimetrias de informação, o preço não reflete necessariamente a qualidade."
-        },
-        {
-            "pergunta": "No modelo de Mankiw, os custos de menu tornam ajustes frequentes de preços inviáveis, mesmo com pequenas mudanças na demanda.",
-            "resposta_correta": "V",
-            "justificativa": "Custos de menu tornam o ajuste oneroso, levando as empresas a alterarem preços com menos frequência."
-        },
-        {
-            "pergunta": "A rigidez de preços pode provocar falhas de coordenação e resultar em equilíbrios subótimos.",
-            "resposta_correta": "V",
-            "justificativa": "A dificuldade de ajustes simultâneos pode gerar distorções na economia."
-        },
-        {
-            "pergunta": "A rigidez nominal de preços é irrelevante para a política monetária, pois não afeta o produto real.",
-            "resposta_correta": "F",
-            "justificativa": "A rigidez nominal pode amplificar os efeitos das políticas monetárias, afetando o produto no curto prazo."
-        }
-    ]
-
-    perguntas_mercado = [
-        {
-            "pergunta": "No mercado de trabalho, o conceito de salário de eficiência sugere que salários mais altos podem elevar a produtividade dos trabalhadores.",
-            "resposta_correta": "V",
-            "justificativa": "Salários elevados podem reduzir a rotatividade e incentivar maior empenho, aumentando a produtividade."
-        },
-        {
-            "pergunta": "De acordo com a teoria neoclássica, um aumento na taxa de juros sempre resulta em maior oferta de crédito no mercado bancário.",
-            "resposta_correta": "F",
-            "justificativa": "A elevação dos juros pode aumentar o risco de inadimplência e, consequentemente, reduzir a oferta de crédito."
-        },
-        {
-            "pergunta": "A assimetria de informação no mercado de trabalho pode ocasionar desemprego involuntário, mesmo quando os salários são flexíveis.",
-            "resposta_correta": "V",
-            "justificativa": "A dificuldade em distinguir entre trabalhadores produtivos e menos produtivos pode levar a ineficiências no emprego."
-        },
-        {
-            "pergunta": "O fenômeno da histerese implica que recessões podem ter efeitos permanentes sobre o produto potencial da economia.",
-            "resposta_correta": "V",
-            "justificativa": "Recessões podem deixar cicatrizes, afetando a capacidade produtiva de forma duradoura."
-        },
-        {
-            "pergunta": "O postulado de homogeneidade foi refutado por modelos que ressaltam a heterogeneidade e as assimetrias de informação entre os agentes.",
-            "resposta_correta": "V",
-            "justificativa": "Esses modelos mostram que qualidade e preço não estão necessariamente correlacionados em mercados reais."
-        },
-        {
-            "pergunta": "A refutação do postulado de homogeneidade afirma que, em mercados com assimetria de informação, o preço sempre reflete a qualidade do bem.",
-            "resposta_correta": "F",
-            "justificativa": "Em mercados com informação imperfeita, preços podem não refletir qualidade, como destacado por Akerlof no problema do 'mercado de limões'"
-        },
-        {
-            "pergunta": "Salários de eficiência não têm relevância para explicar o desemprego involuntário.",
-            "resposta_correta": "F",
-            "justificativa": "O conceito de salário de eficiência pode afetar a produtividade e, por consequência, os níveis de emprego."
-        },
-        {
-            "pergunta": "Assimetrias de informação no mercado de trabalho podem levar à seleção adversa, prejudicando a alocação eficiente dos recursos humanos.",
-            "resposta_correta": "V",
-            "justificativa": "Quando os empregadores não conseguem diferenciar a qualidade dos candidatos, ocorre seleção adversa."
-        },
-        {
-            "pergunta": "Problemas de moral hazard no mercado bancário são irrelevantes para a concessão de crédito.",
-            "resposta_correta": "F",
-            "justificativa": "O moral hazard aumenta o risco dos empréstimos, impactando negativamente a oferta de crédito."
-        },
-        {
-            "pergunta": "Em mercados com informação perfeita, a regulação bancária seria desnecessária.",
-            "resposta_correta": "V",
-            "justificativa": "A informação perfeita permitiria ajustes eficientes nos contratos, reduzindo a necessidade de intervenção regulatória."
-        }
-    ]
+        opcoes = ["Página Inicial", "Simulado", "Revisão", "Ranking"] + [t.menu for t in banco.topicos]
+        if admin_liberado():
+            opcoes.append("Administração")
+        menu = st.radio("Selecione um tópico:", opcoes)
+
+        st.markdown("---")
+        busca_lateral()
+
+        # Desempenho por tópico, lido direto das contagens do placar
+        st.markdown("---")
+        st.subheader("📈 Seu desempenho")
+        placar = obter_placar()
+        linhas = []
+        for t in banco.topicos:
+            respondidas, acertos = placar.contagem(t.chave)
+            linhas.append(f"- {t.menu}: **{acertos}/{respondidas}** acertos ({t.total} questões)")
+        st.markdown("\n".join(linhas))
 
     # Conteúdo principal baseado no menu selecionado
     if menu == "Página Inicial":
@@ -451,66 +586,28 @@ def main():
             """, unsafe_allow_html=True)
 
         with col2:
-            st.markdown("""
-            <div style="padding: 20px; border-radius: 10px; background-color: #1E293B; 
-                        box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 20px; height: 520px;">
-                <h3 style="color: #F9FAFB;">📊 Estatísticas do Quiz</h3>
-                <div style="margin-top: 25px;">
-                    <p style="font-size: 16px;">Total de questões: <strong>49</strong></p>
-                    <p style="font-size: 16px;">Questões por tópico:</p>
-                    <ul>
-                        <li>Kalecki: 7 questões</li>
-                        <li>Teoria das Expectativas Racionais: 16 questões</li>
-                        <li>Ciclos Reais de Negócios: 7 questões</li>
-                        <li>Modelos Novo-Keynesianos: 9 questões</li>
-                        <li>Mercado de Trabalho: 10 questões</li>
-                    </ul>
-                    <p style="font-size: 16px; margin-top: 20px;">Tempo estimado: <strong>30-40 minutos</strong></p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            # Estatísticas montadas das contagens do índice (uma vez por versão): a
+            # página inicial não lê o conteúdo de nenhum tópico
+            resumo = estatisticas_banco(banco).resumo()
+            st.markdown(estatisticas_html(resumo), unsafe_allow_html=True)
+
+    elif menu == "Simulado":
+        criar_simulado(banco)
+
+    elif menu == "Revisão":
+        criar_revisao(banco)
+
+    elif menu == "Ranking":
+        criar_ranking(banco)
+
+    elif menu == "Administração":
+        criar_admin(banco)
 
-    elif menu == "Kalecki":
-        criar_secao(
-            "Kalecki",
-            "E sua aproximação da crítica feita por Keynes aos neoclássicos",
-            perguntas_kalecki,
-            "🧐"
-        )
-
-
-    elif menu == "Teoria das Expectativas Racionais":
-        criar_secao(
-            "Teoria das Expectativas Racionais (TER)",
-            "Teste seus conhecimentos sobre como os agentes formam expectativas e como isso afeta a economia.",
-            perguntas_TER,
-            "📊"
-        )
-
-    elif menu == "Ciclos Reais de Negócios":
-        criar_secao(
-            "Modelos de Ciclos Reais de Negócios",
-            "Avalie sua compreensão sobre como choques de produtividade podem afetar a economia.",
-            perguntas_ciclos,
-            "📈"
-        )
-
-    elif menu == "Modelos Novo-Keynesianos":
-        criar_secao(
-            "Modelos Novo-Keynesianos e Custos de Cardápio",
-            "Teste seu conhecimento sobre rigidez de preços e seus efeitos na economia.",
-            perguntas_nk,
-            "🏛️"
-        )
-
-    elif menu == "Mercado de Trabalho e Assimetrias":
-        criar_secao(
-            "Mercado de Trabalho, Bancário e Assimetria de Informação",
-            "Verifique sua compreensão sobre problemas de informação nos mercados reais.",
-            perguntas_mercado,
-            "💼"
-        )
+    else:
+        topico = banco.por_menu(menu)
+        criar_secao(topico.chave, topico.titulo, topico.descricao, banco.perguntas(topico.chave), topico.emoji)
 
 
 if __name__ == "__main__":
-    main()
+    with medir("rerun"):
+        main()
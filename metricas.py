@@ -0,0 +1,170 @@
+"""Instrumentação opcional das fases de um rerun.
+
+Desligada por padrão. Ativada pela variável de ambiente QUIZ_METRICAS:
+    jsonl:/caminho/metricas.jsonl  -> uma linha JSON por medição
+    prometheus:9108                -> endpoint HTTP em texto no formato Prometheus
+
+Com vários workers (multiprocesso.py) cada um recebe a sua porta do
+exportador: a porta configurada no primeiro, a seguinte no segundo e assim por
+diante.
+
+Uso:
+    with medir("criar_secao"):
+        ...
+
+    @medido("mostrar_pergunta")
+    def mostrar_pergunta(...): ...
+
+    contar("eventos_descartados")
+
+Com a instrumentação desligada, ``medir`` devolve sempre o mesmo objeto nulo,
+sem relógio, lock ou alocação, ``medido`` devolve a própria função e
+``contar`` não faz nada.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import warnings
+
+CONFIG = os.environ.get("QUIZ_METRICAS", "")
+ATIVO = bool(CONFIG)
+
+
+class _MedicaoNula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULA = _MedicaoNula()
+
+
+class _Coletor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fases = {}  # fase -> [chamadas, segundos]
+        self.contadores = {}  # nome -> total
+        self._arquivo = None
+
+    def registrar(self, fase, segundos):
+        with self._lock:
+            acumulado = self.fases.setdefault(fase, [0, 0.0])
+            acumulado[0] += 1
+            acumulado[1] += segundos
+            if self._arquivo is not None:
+                self._arquivo.write(json.dumps({"ts": time.time(), "pid": os.getpid(),
+                                                "fase": fase, "ms": round(segundos * 1000, 3)}) + "\n")
+
+    def somar(self, nome, quantidade):
+        with self._lock:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+            if self._arquivo is not None:
+                self._arquivo.write(json.dumps({"ts": time.time(), "pid": os.getpid(),
+                                                "contador": nome, "n": quantidade}) + "\n")
+
+    def abrir_jsonl(self, caminho):
+        # Buffer de linha: cada medição chega ao disco sem um flush explícito por chamada
+        self._arquivo = open(caminho, "a", encoding="utf-8", buffering=1)
+
+    def texto_prometheus(self):
+        with self._lock:
+            fases = {f: tuple(v) for f, v in self.fases.items()}
+            contadores = dict(self.contadores)
+        linhas = ["# TYPE quiz_fase_chamadas_total counter",
+                  "# TYPE quiz_fase_segundos_total counter"]
+        for fase, (chamadas, segundos) in sorted(fases.items()):
+            linhas.append(f'quiz_fase_chamadas_total{{fase="{fase}"}} {chamadas}')
+            linhas.append(f'quiz_fase_segundos_total{{fase="{fase}"}} {segundos:.6f}')
+        for nome, total in sorted(contadores.items()):
+            linhas.append(f"# TYPE quiz_{nome}_total counter")
+            linhas.append(f"quiz_{nome}_total {total}")
+        return "\n".join(linhas) + "\n"
+
+
+coletor = _Coletor()
+
+
+class _Medicao:
+    __slots__ = ("fase", "inicio")
+
+    def __init__(self, fase):
+        self.fase = fase
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        coletor.registrar(self.fase, time.perf_counter() - self.inicio)
+        return False
+
+
+def medir(fase):
+    if not ATIVO:
+        return _NULA
+    return _Medicao(fase)
+
+
+def medido(fase):
+    def decorador(func):
+        if not ATIVO:
+            return func
+
+        @functools.wraps(func)
+        def envolvida(*args, **kwargs):
+            with _Medicao(fase):
+                return func(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+def contar(nome, quantidade=1):
+    """Soma ``quantidade`` ao contador ``nome`` (exposto como quiz_<nome>_total)."""
+    if ATIVO:
+        coletor.somar(nome, quantidade)
+
+
+def _servir_prometheus(porta):
+    # Importado aqui para não pesar na partida do app quando o exportador está desligado
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            corpo = coletor.texto_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        servidor = ThreadingHTTPServer(("0.0.0.0", porta), Handler)
+    except OSError as e:
+        # Porta ocupada (outro worker, outro app): o app segue sem o exportador
+        warnings.warn(f"Exportador Prometheus desligado: porta {porta} indisponível ({e})")
+        return
+    threading.Thread(target=servidor.serve_forever, daemon=True, name="quiz-metricas").start()
+
+
+def _configurar(config):
+    tipo, _, destino = config.partition(":")
+    if tipo == "jsonl":
+        coletor.abrir_jsonl(destino)
+    elif tipo == "prometheus":
+        _servir_prometheus(int(destino))
+    else:
+        raise ValueError(f"QUIZ_METRICAS inválido: {config!r}")
+
+
+# O módulo é importado uma vez por processo, então o exportador também sobe uma vez só
+if ATIVO:
+    _configurar(CONFIG)
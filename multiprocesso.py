@@ -0,0 +1,113 @@
+"""Modo de implantação com vários workers Streamlit atrás de um balanceador local.
+
+Cada worker é um processo ``streamlit run`` independente (nada é compartilhado em
+memória); as respostas ficam no backend definido por QUIZ_BACKEND, de modo que
+uma sessão pode ser atendida por qualquer worker. O ranking da turma só é
+compartilhado entre os workers com o backend redis; com os outros ele fica
+indisponível (ver ranking.py).
+
+Uso:
+    python multiprocesso.py --workers 4 --porta 8501
+    QUIZ_BACKEND=redis://localhost:6379/0 python multiprocesso.py
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import secrets
+import signal
+import subprocess
+import sys
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "macroapp_p2_NOVO.py")
+BACKEND_MULTIPROCESSO = "sqlite:///" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_sessoes.db")
+
+
+def iniciar_workers(quantidade, porta_base):
+    env = dict(os.environ)
+    # O backend em memória não é compartilhado entre processos
+    if env.get("QUIZ_BACKEND", "memoria") == "memoria":
+        env["QUIZ_BACKEND"] = BACKEND_MULTIPROCESSO
+
+    # Mesmo segredo em todos os workers para que o cookie XSRF emitido por um
+    # seja aceito pelos outros
+    env.setdefault("STREAMLIT_SERVER_COOKIE_SECRET", secrets.token_hex(32))
+
+    # O ranking da turma só é mostrado com vários workers se for compartilhado (ver ranking.py)
+    env["QUIZ_WORKERS"] = str(quantidade)
+
+    # Cada worker expõe as próprias métricas: a porta do exportador é deslocada por worker
+    tipo_metricas, _, porta_metricas = env.get("QUIZ_METRICAS", "").partition(":")
+
+    processos = []
+    for i in range(quantidade):
+        porta = porta_base + i
+        if tipo_metricas == "prometheus":
+            env["QUIZ_METRICAS"] = f"prometheus:{int(porta_metricas) + i}"
+        processos.append(subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP,
+             "--server.port", str(porta),
+             "--server.headless", "true",
+             "--browser.gatherUsageStats", "false"],
+            env=dict(env),
+        ))
+    return processos
+
+
+async def _encaminhar(leitor, escritor):
+    try:
+        while dados := await leitor.read(65536):
+            escritor.write(dados)
+            await escritor.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def balancear(porta, portas_workers, host="127.0.0.1"):
+    """Proxy TCP round-robin: cada conexão (HTTP ou websocket) vai para o próximo worker."""
+    proximo = itertools.cycle(portas_workers)
+
+    async def atender(leitor_cliente, escritor_cliente):
+        for _ in portas_workers:
+            porta_worker = next(proximo)
+            try:
+                leitor_worker, escritor_worker = await asyncio.open_connection(host, porta_worker)
+                break
+            except OSError:
+                continue  # worker ainda subindo ou fora do ar: tenta o seguinte
+        else:
+            escritor_cliente.close()
+            return
+        await asyncio.gather(_encaminhar(leitor_cliente, escritor_worker),
+                             _encaminhar(leitor_worker, escritor_cliente))
+
+    servidor = await asyncio.start_server(atender, "0.0.0.0", porta)
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--porta", type=int, default=8501, help="porta pública do balanceador")
+    parser.add_argument("--porta-base", type=int, default=8600, help="porta do primeiro worker")
+    args = parser.parse_args()
+
+    processos = iniciar_workers(args.workers, args.porta_base)
+    portas = [args.porta_base + i for i in range(args.workers)]
+    print(f"{args.workers} workers nas portas {portas[0]}-{portas[-1]}; balanceador em :{args.porta}")
+    try:
+        asyncio.run(balancear(args.porta, portas))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for p in processos:
+            p.send_signal(signal.SIGTERM)
+        for p in processos:
+            p.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import NamedTuple
+
+
+class RegistroResposta(NamedTuple):
+    chave_topico: str
+    resposta: str
+    correta: bool
+    instante: datetime
+
+
+class Placar:
+    """Livro de respostas de uma sessão, com contagens por tópico mantidas em O(1).
+
+    ``respostas`` guarda a última resposta de cada questão (id -> RegistroResposta)
+    e ``por_topico`` guarda ``[respondidas, acertos, acertos de primeira]`` de cada
+    tópico, atualizados a cada registro para que nem a barra de progresso nem a
+    barra lateral precisem percorrer as questões. ``primeiras`` guarda a primeira
+    resposta dada a cada questão (id -> "V"/"F"): é ela que conta para o ranking,
+    já que os botões continuam ativos e a resposta pode ser trocada depois de
+    ver a correção.
+    """
+
+    __slots__ = ("respostas", "por_topico", "primeiras")
+
+    def __init__(self):
+        self.respostas = {}
+        self.por_topico = {}
+        self.primeiras = {}
+
+    def registrar(self, chave_topico, q, resposta, instante=None):
+        anterior = self.respostas.get(q.id)
+        contagem = self.por_topico.setdefault(chave_topico, [0, 0, 0])
+        if anterior is None:
+            contagem[0] += 1
+        elif anterior.correta:
+            contagem[1] -= 1
+
+        registro = RegistroResposta(chave_topico, resposta, resposta == q.resposta_correta,
+                                    instante or datetime.now())
+        if registro.correta:
+            contagem[1] += 1
+        if anterior is None:
+            self.primeiras[q.id] = resposta
+            contagem[2] += registro.correta
+        self.respostas[q.id] = registro
+        return registro
+
+    @classmethod
+    def a_partir_de(cls, respostas, primeiras=None):
+        """Reconstrói o placar a partir de ``{id: RegistroResposta}`` vindo de um backend.
+
+        ``primeiras`` (id -> "V"/"F") vem do estado "primeiras" da sessão; sem
+        ela, a última resposta conta também como a primeira.
+        """
+        primeiras = primeiras or {}
+        placar = cls()
+        for id_pergunta, registro in respostas.items():
+            placar.respostas[id_pergunta] = registro
+            primeira = primeiras.get(id_pergunta, registro.resposta)
+            placar.primeiras[id_pergunta] = primeira
+            contagem = placar.por_topico.setdefault(registro.chave_topico, [0, 0, 0])
+            contagem[0] += 1
+            contagem[1] += registro.correta
+            # Só há duas respostas possíveis: a primeira acertou se coincide com
+            # uma última resposta certa ou difere de uma errada
+            contagem[2] += (primeira == registro.resposta) == registro.correta
+        return placar
+
+    def resposta(self, id_pergunta):
+        return self.respostas.get(id_pergunta)
+
+    def contagem(self, chave_topico):
+        """Devolve ``(respondidas, acertos)`` do tópico."""
+        respondidas, acertos, _ = self.por_topico.get(chave_topico, (0, 0, 0))
+        return respondidas, acertos
+
+    def total(self):
+        respondidas = acertos = 0
+        for r, a, _ in self.por_topico.values():
+            respondidas += r
+            acertos += a
+        return respondidas, acertos
+
+    def acertos_de_primeira(self, chave_topico=None):
+        """Acertos na primeira tentativa do tópico (ou de todos, sem ``chave_topico``)."""
+        if chave_topico is not None:
+            return self.por_topico.get(chave_topico, (0, 0, 0))[2]
+        return sum(contagem[2] for contagem in self.por_topico.values())
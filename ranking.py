@@ -0,0 +1,315 @@
+"""Ranking da turma, geral e por tópico, alimentado pela correção das respostas.
+
+Cada ranking é uma skip list indexável ordenada por (-acertos, instante em que
+o aluno chegou a essa pontuação, sessão): atualizar a pontuação, consultar a
+posição de um aluno e listar os K primeiros custam O(log n) (+K). Todas as
+sessões do processo compartilham a mesma Classificacao; as atualizações são
+serializadas por um lock e o quadro exibido é recalculado no máximo a cada
+INTERVALO_QUADRO segundos, não a cada rerun.
+
+Com vários workers (multiprocesso.py) um ranking por processo mostraria só os
+alunos de cada worker. Com o backend redis os rankings ficam em sorted sets
+compartilhados (ClassificacaoRedis); com qualquer outro backend o ranking fica
+indisponível em vez de parcial.
+"""
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+INTERVALO_QUADRO = float(os.environ.get("QUIZ_INTERVALO_RANKING", "5"))
+# Quantos workers atendem o app (definido por multiprocesso.iniciar_workers)
+WORKERS = int(os.environ.get("QUIZ_WORKERS", "1"))
+NIVEIS_MAXIMOS = 32
+
+
+class _No:
+    __slots__ = ("chave", "proximos", "larguras")
+
+    def __init__(self, chave, niveis):
+        self.chave = chave
+        self.proximos = [None] * niveis
+        self.larguras = [1] * niveis  # quantas posições cada ligação avança
+
+
+class ListaIndexavel:
+    """Skip list com chaves únicas e acesso por posição, tudo em O(log n) esperado.
+
+    Não é thread-safe; quem compartilha a lista entre threads usa um lock.
+    """
+
+    __slots__ = ("_cabeca", "_niveis", "_tamanho", "_rng")
+
+    def __init__(self, semente=None):
+        self._cabeca = _No(None, NIVEIS_MAXIMOS)
+        self._niveis = 1
+        self._tamanho = 0
+        self._rng = random.Random(semente)
+
+    def __len__(self):
+        return self._tamanho
+
+    def __iter__(self):
+        no = self._cabeca.proximos[0]
+        while no is not None:
+            yield no.chave
+            no = no.proximos[0]
+
+    def _caminho(self, chave):
+        """Último nó antes de ``chave`` em cada nível e a posição desse nó (cabeça = 0)."""
+        anteriores = [self._cabeca] * NIVEIS_MAXIMOS
+        posicoes = [0] * NIVEIS_MAXIMOS
+        no, posicao = self._cabeca, 0
+        for nivel in reversed(range(self._niveis)):
+            while no.proximos[nivel] is not None and no.proximos[nivel].chave < chave:
+                posicao += no.larguras[nivel]
+                no = no.proximos[nivel]
+            anteriores[nivel] = no
+            posicoes[nivel] = posicao
+        return anteriores, posicoes
+
+    def inserir(self, chave):
+        anteriores, posicoes = self._caminho(chave)
+        seguinte = anteriores[0].proximos[0]
+        if seguinte is not None and seguinte.chave == chave:
+            raise KeyError(f"Chave repetida: {chave!r}")
+
+        niveis = 1
+        while niveis < NIVEIS_MAXIMOS and self._rng.random() < 0.5:
+            niveis += 1
+        if niveis > self._niveis:
+            for nivel in range(self._niveis, niveis):
+                self._cabeca.proximos[nivel] = None
+                self._cabeca.larguras[nivel] = self._tamanho + 1
+            self._niveis = niveis
+
+        novo = _No(chave, niveis)
+        posicao = posicoes[0] + 1
+        for nivel in range(niveis):
+            anterior = anteriores[nivel]
+            novo.proximos[nivel] = anterior.proximos[nivel]
+            anterior.proximos[nivel] = novo
+            novo.larguras[nivel] = anterior.larguras[nivel] - (posicao - posicoes[nivel]) + 1
+            anterior.larguras[nivel] = posicao - posicoes[nivel]
+        for nivel in range(niveis, self._niveis):
+            anteriores[nivel].larguras[nivel] += 1
+        self._tamanho += 1
+
+    def remover(self, chave):
+        anteriores, _ = self._caminho(chave)
+        alvo = anteriores[0].proximos[0]
+        if alvo is None or alvo.chave != chave:
+            raise KeyError(chave)
+        for nivel in range(self._niveis):
+            anterior = anteriores[nivel]
+            if anterior.proximos[nivel] is alvo:
+                anterior.larguras[nivel] += alvo.larguras[nivel] - 1
+                anterior.proximos[nivel] = alvo.proximos[nivel]
+            else:
+                anterior.larguras[nivel] -= 1
+        while self._niveis > 1 and self._cabeca.proximos[self._niveis - 1] is None:
+            self._niveis -= 1
+        self._tamanho -= 1
+
+    def posicao(self, chave):
+        """Posição de ``chave`` (a partir de 0)."""
+        anteriores, posicoes = self._caminho(chave)
+        alvo = anteriores[0].proximos[0]
+        if alvo is None or alvo.chave != chave:
+            raise KeyError(chave)
+        return posicoes[0]
+
+    def __getitem__(self, indice):
+        if not 0 <= indice < self._tamanho:
+            raise IndexError(indice)
+        alvo = indice + 1
+        no, posicao = self._cabeca, 0
+        for nivel in reversed(range(self._niveis)):
+            while no.proximos[nivel] is not None and posicao + no.larguras[nivel] <= alvo:
+                posicao += no.larguras[nivel]
+                no = no.proximos[nivel]
+        return no.chave
+
+
+class Classificado(NamedTuple):
+    posicao: int
+    sessao: str
+    nome: str
+    acertos: int
+
+
+class Quadro(NamedTuple):
+    primeiros: tuple   # Classificado, do primeiro ao K-ésimo
+    participantes: int
+    gerado_em: float   # time.time()
+
+
+class Ranking:
+    """Um ranking (geral ou de um tópico); quem o usa entre threads segura o lock da Classificacao."""
+
+    __slots__ = ("_lista", "_chaves")
+
+    def __init__(self):
+        self._lista = ListaIndexavel()
+        self._chaves = {}  # sessao -> chave atual na lista
+
+    def __len__(self):
+        return len(self._lista)
+
+    def atualizar(self, sessao, acertos, instante):
+        atual = self._chaves.get(sessao)
+        if atual is not None:
+            # Mesma pontuação: o aluno mantém o lugar de quando chegou a ela
+            if atual[0] == -acertos:
+                return
+            self._lista.remover(atual)
+        chave = (-acertos, instante, sessao)
+        self._lista.inserir(chave)
+        self._chaves[sessao] = chave
+
+    def posicao(self, sessao):
+        """Posição do aluno (a partir de 1), ou None se ele ainda não pontuou aqui."""
+        chave = self._chaves.get(sessao)
+        return None if chave is None else self._lista.posicao(chave) + 1
+
+    def primeiros(self, k):
+        resultado = []
+        for chave in self._lista:
+            if len(resultado) == k:
+                break
+            resultado.append(chave)
+        return resultado
+
+
+class Classificacao:
+    """Rankings da turma compartilhados pelas sessões do processo.
+
+    ``registrar`` é chamado a cada correção; ``quadro`` devolve os K primeiros
+    de um ranking, recalculado no máximo a cada ``intervalo`` segundos para que
+    muitas sessões olhando o ranking não disputem o lock a cada rerun.
+    """
+
+    GERAL = None
+
+    def __init__(self, intervalo=INTERVALO_QUADRO):
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._rankings = {self.GERAL: Ranking()}
+        self._nomes = {}
+        self._quadros = {}  # (chave do tópico, k) -> (validade, Quadro)
+
+    def registrar(self, sessao, nome, chave_topico, acertos_topico, acertos_total, instante=None):
+        instante = time.time() if instante is None else instante
+        with self._lock:
+            self._nomes[sessao] = nome
+            self._rankings[self.GERAL].atualizar(sessao, acertos_total, instante)
+            ranking = self._rankings.get(chave_topico)
+            if ranking is None:
+                ranking = self._rankings[chave_topico] = Ranking()
+            ranking.atualizar(sessao, acertos_topico, instante)
+
+    def renomear(self, sessao, nome):
+        with self._lock:
+            if sessao in self._nomes:
+                self._nomes[sessao] = nome
+
+    def posicao(self, sessao, chave_topico=GERAL):
+        """Devolve ``(posição, participantes)``; a posição é None se o aluno não está no ranking."""
+        with self._lock:
+            ranking = self._rankings.get(chave_topico)
+            if ranking is None:
+                return None, 0
+            return ranking.posicao(sessao), len(ranking)
+
+    def quadro(self, chave_topico=GERAL, k=10):
+        agora = time.monotonic()
+        em_cache = self._quadros.get((chave_topico, k))
+        if em_cache is not None and agora < em_cache[0]:
+            return em_cache[1]
+        with self._lock:
+            ranking = self._rankings.get(chave_topico) or Ranking()
+            primeiros = tuple(Classificado(i, sessao, self._nomes[sessao], -negativo)
+                              for i, (negativo, _, sessao) in enumerate(ranking.primeiros(k), 1))
+            quadro = Quadro(primeiros, len(ranking), time.time())
+        self._quadros[(chave_topico, k)] = (agora + self.intervalo, quadro)
+        return quadro
+
+
+class ClassificacaoRedis:
+    """Mesma interface da Classificacao, com os rankings em sorted sets do Redis.
+
+    A nota de cada aluno junta acertos e instante, ``acertos·10¹⁰ + (10¹⁰ -
+    instante)``, para que ZREVRANGE/ZREVRANK ordenem por mais acertos e, no
+    empate, por quem chegou antes à pontuação. Todos os workers leem e gravam
+    os mesmos rankings; o quadro continua com cache local de ``intervalo``
+    segundos.
+    """
+
+    GERAL = None
+    _ESCALA = 10 ** 10
+
+    def __init__(self, url, intervalo=INTERVALO_QUADRO):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("O ranking no redis requer o pacote 'redis' (pip install redis)") from None
+        self.intervalo = intervalo
+        self._cliente = redis.Redis.from_url(url)
+        self._quadros = {}  # (chave do tópico, k) -> (validade, Quadro)
+
+    @staticmethod
+    def _chave(chave_topico):
+        return "quiz:ranking:geral" if chave_topico is None else f"quiz:ranking:topico:{chave_topico}"
+
+    def _atualizar(self, chave, sessao, acertos, instante):
+        atual = self._cliente.zscore(chave, sessao)
+        # Mesma pontuação: o aluno mantém o lugar de quando chegou a ela
+        if atual is None or int(atual) // self._ESCALA != acertos:
+            self._cliente.zadd(chave, {sessao: acertos * self._ESCALA + (self._ESCALA - instante)})
+
+    def registrar(self, sessao, nome, chave_topico, acertos_topico, acertos_total, instante=None):
+        instante = time.time() if instante is None else instante
+        self._cliente.hset("quiz:ranking:nomes", sessao, nome)
+        self._atualizar(self._chave(self.GERAL), sessao, acertos_total, instante)
+        self._atualizar(self._chave(chave_topico), sessao, acertos_topico, instante)
+
+    def renomear(self, sessao, nome):
+        if self._cliente.zscore(self._chave(self.GERAL), sessao) is not None:
+            self._cliente.hset("quiz:ranking:nomes", sessao, nome)
+
+    def posicao(self, sessao, chave_topico=GERAL):
+        """Devolve ``(posição, participantes)``; a posição é None se o aluno não está no ranking."""
+        chave = self._chave(chave_topico)
+        with self._cliente.pipeline() as pipe:
+            posicao, participantes = pipe.zrevrank(chave, sessao).zcard(chave).execute()
+        return (None if posicao is None else posicao + 1), participantes
+
+    def quadro(self, chave_topico=GERAL, k=10):
+        agora = time.monotonic()
+        em_cache = self._quadros.get((chave_topico, k))
+        if em_cache is not None and agora < em_cache[0]:
+            return em_cache[1]
+        chave = self._chave(chave_topico)
+        with self._cliente.pipeline() as pipe:
+            primeiros, participantes = pipe.zrevrange(chave, 0, k - 1, withscores=True).zcard(chave).execute()
+        sessoes = [s.decode() for s, _ in primeiros]
+        nomes = self._cliente.hmget("quiz:ranking:nomes", sessoes) if sessoes else []
+        quadro = Quadro(tuple(Classificado(i, sessao, (nome or b"").decode(), int(nota) // self._ESCALA)
+                              for i, (sessao, nome, (_, nota)) in enumerate(zip(sessoes, nomes, primeiros), 1)),
+                        participantes, time.time())
+        self._quadros[(chave_topico, k)] = (agora + self.intervalo, quadro)
+        return quadro
+
+
+# Classificação compartilhada pelas sessões: no Redis quando esse é o backend;
+# senão, a do processo, e nenhuma (None) com vários workers, em que ela seria parcial
+@lru_cache(maxsize=None)
+def obter_classificacao():
+    url = os.environ.get("QUIZ_BACKEND", "")
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return ClassificacaoRedis(url)
+    if WORKERS > 1:
+        return None
+    return Classificacao()
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import re
+
+from cache_lru import CacheLRU
+
+
+# Fragmentos HTML estáticos do quiz. Cada fragmento é montado uma única vez por
+# processo e reaproveitado em todos os reruns e sessões, num cache LRU para que
+# a memória não cresça com o tamanho do banco.
+
+DIVISOR_HTML = "<hr style='margin: 30px 0; border: none; height: 1px; background-color: #E5E7EB;'>"
+
+SECAO_CONCLUIDA_HTML = "<p style='text-align: right;'>Seção concluída!</p>"
+
+# CSS da página, compartilhado pelo app e pela exportação estática. O app o
+# serve como arquivo estático (server.enableStaticServing em .streamlit/config.toml)
+CAMINHO_ESTILO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "estilo.css")
+with open(CAMINHO_ESTILO, encoding="utf-8") as _f:
+    ESTILO_PAGINA = _f.read()
+
+# O st.html remove <link>, então um script curto insere a folha de estilo no
+# <head> uma única vez; o ?v= muda com o conteúdo e invalida o cache do navegador.
+# A cada rerun completo só este script (~400 bytes) é reenviado, não o CSS
+_URL_ESTILO = "app/static/estilo.css?v=" + hashlib.sha1(ESTILO_PAGINA.encode("utf-8")).hexdigest()[:10]
+ESTILO_LINK_HTML = f"""<script id="quiz-estilo-carregador">
+(() => {{
+  let link = document.getElementById("quiz-estilo");
+  if (!link) {{
+    link = document.createElement("link");
+    link.id = "quiz-estilo";
+    link.rel = "stylesheet";
+    document.head.appendChild(link);
+  }}
+  if (link.getAttribute("href") !== "{_URL_ESTILO}") link.setAttribute("href", "{_URL_ESTILO}");
+}})();
+</script>"""
+
+# Alternativa sem o servidor de arquivos estáticos: o CSS compacto vai inline
+ESTILO_HTML = "<style>" + re.sub(r"\s*([{};:,])\s*", r"\1", ESTILO_PAGINA).strip() + "</style>"
+
+FRAGMENTOS_EM_CACHE = 4096
+
+_cache_html = CacheLRU(FRAGMENTOS_EM_CACHE)
+
+
+def hash_conteudo(*partes):
+    """Hash curto do conteúdo, usado para invalidar fragmentos quando o texto muda."""
+    return hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()[:12]
+
+
+def _memo(chave, montar):
+    return _cache_html.obter(chave, montar)
+
+
+def cabecalho_secao_html(chave_topico, titulo, descricao, emoji):
+    chave = ("secao", chave_topico, hash_conteudo(titulo, descricao, emoji))
+    return _memo(chave, lambda: f"""
+    <div style="display: flex; align-items: center; margin: 30px 0 20px 0;">
+        <div style="font-size: 30px; margin-right: 15px;">{emoji}</div>
+        <h2 style="margin: 0; color: #F9FAFB;">{titulo}</h2>
+    </div>
+    <p style="margin-bottom: 25px; color: #4B5563;">{descricao}</p>
+    """)
+
+
+def cartao_html(chave_topico, q, index, total_perguntas):
+    chave = ("cartao", chave_topico, q.id, hash_conteudo(q.pergunta), index, total_perguntas)
+    return _memo(chave, lambda: f"""
+        <div style="padding: 20px; border-radius: 10px; background-color: #1E293B;
+                    box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 20px;">
+            <h4 style="color: #F9FAFB; margin-bottom: 15px;">Questão {index}/{total_perguntas}</h4>
+            <p style="font-size: 16px; margin-bottom: 20px;">{q.pergunta}</p>
+        </div>
+        """)
+
+
+def justificativa_html(chave_topico, q, justificativa):
+    chave = ("justificativa", chave_topico, q.id, hash_conteudo(justificativa))
+    return _memo(chave, lambda: f"""
+            <div style="padding: 15px; border-left: 4px solid #F9FAFB;
+                        background-color: black; margin: 10px 0px 20px 0px;">
+                <strong>Justificativa:</strong> {justificativa}
+            </div>
+            """)
+
+
+def fragmentos_pagina(chave_topico, titulo, descricao, emoji, perguntas, inicio, fim):
+    """Agrupa o HTML estático de uma página da seção em um bloco por questão.
+
+    O cabeçalho da seção vai junto com o primeiro cartão da página e o divisor
+    de cada questão vai junto com o cartão seguinte, de modo que cada questão
+    emite um único elemento de markdown em vez de dois ou três. Só as questões
+    da página entram na chave do cache, então o custo não depende do tamanho
+    do tópico.
+    """
+    total = len(perguntas)
+    pagina = perguntas[inicio:fim]
+    chave = ("pagina", chave_topico, inicio, total,
+             hash_conteudo(titulo, descricao, emoji, *(q.id + q.pergunta for q in pagina)))
+
+    def montar():
+        blocos = []
+        prefixo = cabecalho_secao_html(chave_topico, titulo, descricao, emoji)
+        for i, q in enumerate(pagina, inicio):
+            blocos.append(prefixo + cartao_html(chave_topico, q, i + 1, total))
+            prefixo = DIVISOR_HTML
+        return tuple(blocos)
+
+    return _memo(chave, montar)
+
+
+def estatisticas_html(resumo):
+    """Card "Estatísticas do Quiz" da página inicial, montado a partir do ResumoBanco."""
+    def montar():
+        itens = "\n".join(f"                        <li>{t.menu}: {t.total} questões</li>" for t in resumo.topicos)
+        minimo, maximo = resumo.minutos_estimados
+        return f"""
+            <div style="padding: 20px; border-radius: 10px; background-color: #1E293B;
+                        box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 20px; height: 520px;">
+                <h3 style="color: #F9FAFB;">📊 Estatísticas do Quiz</h3>
+                <div style="margin-top: 25px;">
+                    <p style="font-size: 16px;">Total de questões: <strong>{resumo.total}</strong>
+                       ({resumo.verdadeiras} V · {resumo.falsas} F)</p>
+                    <p style="font-size: 16px;">Questões por tópico:</p>
+                    <ul>
+{itens}
+                    </ul>
+                    <p style="font-size: 16px;">Tamanho médio: {resumo.media_caracteres_pergunta:.0f} caracteres por pergunta</p>
+                    <p style="font-size: 16px; margin-top: 20px;">Tempo estimado: <strong>{minimo}-{maximo} minutos</strong></p>
+                </div>
+            </div>
+            """
+    return _memo(("estatisticas", resumo), montar)
+
+
+def quadro_ranking_html(quadro, id_sessao):
+    """Tabela dos primeiros do ranking, com a linha do próprio aluno destacada.
+
+    Muda a cada atualização do quadro e traz o aluno da sessão, então não passa
+    pelo cache de fragmentos. Os apelidos vêm dos alunos e são escapados.
+    """
+    # Importado aqui: html.entities pesa na partida e só a página do ranking precisa dele
+    import html
+
+    linhas = []
+    for c in quadro.primeiros:
+        voce = c.sessao == id_sessao
+        estilo = " style='font-weight: 600; color: #FF4B4B;'" if voce else ""
+        nome = html.escape(c.nome) + (" (você)" if voce else "")
+        linhas.append(f"<tr{estilo}><td>{c.posicao}º</td><td>{nome}</td>"
+                      f"<td style='text-align: right;'>{c.acertos}</td></tr>")
+    return ("<table style='width: 100%; border-collapse: collapse;'>"
+            "<thead><tr><th style='text-align: left;'>Posição</th><th style='text-align: left;'>Aluno</th>"
+            "<th style='text-align: right;'>Acertos</th></tr></thead>"
+            f"<tbody>{''.join(linhas)}</tbody></table>")
@@ -0,0 +1,81 @@
+import heapq
+import time
+
+# Intervalo (em segundos) até a próxima revisão em cada caixa de Leitner.
+# Errar manda a questão para a caixa 0; acertar a promove, e quem acerta na
+# última caixa sai da fila de revisão.
+INTERVALOS = (0, 10 * 60, 60 * 60, 24 * 60 * 60, 3 * 24 * 60 * 60)
+
+
+class Revisao:
+    """Agenda de revisão espaçada (Leitner) de um aluno.
+
+    ``itens`` guarda ``id -> (caixa, vencimento)`` e ``_fila`` é um heap de
+    ``(vencimento, id)``. Entradas do heap que não batem mais com ``itens`` são
+    descartadas preguiçosamente em ``proxima``, então registrar uma resposta e
+    pegar a próxima questão custam O(log n), sem varrer o banco nem o histórico.
+    """
+
+    __slots__ = ("itens", "_fila")
+
+    def __init__(self, itens=None):
+        self.itens = dict(itens or {})
+        self._fila = [(vencimento, id_pergunta) for id_pergunta, (_, vencimento) in self.itens.items()]
+        heapq.heapify(self._fila)
+
+    def __len__(self):
+        return len(self.itens)
+
+    def registrar(self, id_pergunta, correta, agora=None):
+        """Atualiza a agenda e devolve o novo ``(caixa, vencimento)`` ou ``None`` se saiu da fila."""
+        agora = int(agora if agora is not None else time.time())
+        atual = self.itens.get(id_pergunta)
+        if correta:
+            if atual is None:
+                return None  # só entram na revisão as questões erradas
+            caixa = atual[0] + 1
+            if caixa >= len(INTERVALOS):
+                del self.itens[id_pergunta]
+                return None
+        else:
+            caixa = 0
+
+        item = self.itens[id_pergunta] = (caixa, agora + INTERVALOS[caixa])
+        heapq.heappush(self._fila, (item[1], id_pergunta))
+        # Compacta o heap quando as entradas antigas passam a dominar
+        if len(self._fila) > 2 * len(self.itens) + 64:
+            self._fila = [(v, i) for i, (_, v) in self.itens.items()]
+            heapq.heapify(self._fila)
+        return item
+
+    def _topo(self):
+        fila = self._fila
+        while fila:
+            vencimento, id_pergunta = fila[0]
+            item = self.itens.get(id_pergunta)
+            if item is not None and item[1] == vencimento:
+                return vencimento, id_pergunta
+            heapq.heappop(fila)  # entrada antiga: a questão foi reagendada ou saiu da fila
+        return None
+
+    def proxima(self, agora=None):
+        """Id da questão vencida há mais tempo, ou ``None`` se nada venceu ainda."""
+        topo = self._topo()
+        agora = agora if agora is not None else time.time()
+        if topo is None or topo[0] > agora:
+            return None
+        return topo[1]
+
+    def proximo_vencimento(self):
+        topo = self._topo()
+        return topo[0] if topo else None
+
+
+# Serialização compacta de um item: "caixa:vencimento"
+def serializar_item(item):
+    return f"{item[0]}:{item[1]}"
+
+
+def desserializar_item(texto):
+    caixa, vencimento = texto.split(":")
+    return int(caixa), int(vencimento)
@@ -0,0 +1,76 @@
+import random
+import weakref
+from itertools import accumulate
+from typing import NamedTuple
+
+
+class IndiceAmostragem(NamedTuple):
+    chaves: tuple           # chave de cada tópico, na ordem do banco
+    tamanhos: tuple         # número de questões de cada tópico (vem do índice do banco)
+    pesos_acumulados: tuple
+
+
+# Índices por banco carregado, indexados pela identidade do banco (sem hash do
+# conteúdo a cada rerun). As referências fracas deixam os índices de um banco
+# substituído numa recarga serem coletados junto com ele.
+_indices = weakref.WeakKeyDictionary()  # banco -> {pesos: IndiceAmostragem}
+
+
+def indice_amostragem(banco, pesos=None):
+    """Índice pré-computado para sortear simulados sem ler nem copiar o banco.
+
+    ``pesos`` é uma tupla ``((chave, peso), ...)``; sem ela, cada tópico pesa
+    o seu número de questões.
+    """
+    do_banco = _indices.get(banco)
+    if do_banco is None:
+        do_banco = _indices[banco] = {}
+    indice = do_banco.get(pesos)
+    if indice is None:
+        indice = do_banco[pesos] = _montar_indice(banco, dict(pesos or ()))
+    return indice
+
+
+def _montar_indice(banco, pesos):
+    topicos = [t for t in banco.topicos if t.total]
+    lista_pesos = [pesos.get(t.chave, t.total) for t in topicos]
+    return IndiceAmostragem(
+        tuple(t.chave for t in topicos),
+        tuple(t.total for t in topicos),
+        tuple(accumulate(lista_pesos)),
+    )
+
+
+def sortear_simulado(indice, quantidade, semente):
+    """Sorteia ``quantidade`` questões (sem repetição) ponderadas por tópico.
+
+    O resultado só depende do índice e da semente, então o mesmo simulado pode
+    ser refeito a partir dela. Devolve uma tupla de ``(chave_topico, posição)``
+    já embaralhada; as perguntas em si são buscadas no banco só para os tópicos
+    sorteados. O custo é proporcional a ``quantidade``, não ao tamanho do banco.
+    """
+    rng = random.Random(semente)
+    tamanhos = indice.tamanhos
+    quantidade = min(quantidade, sum(tamanhos))
+
+    # Quantas questões de cada tópico: sorteio ponderado, limitado ao tamanho do tópico
+    contagens = [0] * len(tamanhos)
+    pesos = list(indice.pesos_acumulados)
+    while quantidade > sum(contagens) and pesos[-1] > 0:
+        faltam = quantidade - sum(contagens)
+        for i in rng.choices(range(len(tamanhos)), cum_weights=pesos, k=faltam):
+            if contagens[i] < tamanhos[i]:
+                contagens[i] += 1
+        # Tópicos esgotados saem do próximo sorteio (peso zero)
+        anterior = 0
+        for i, acumulado in enumerate(indice.pesos_acumulados):
+            peso = 0 if contagens[i] >= tamanhos[i] else acumulado - anterior
+            anterior = acumulado
+            pesos[i] = (pesos[i - 1] if i else 0) + peso
+
+    sorteadas = []
+    for chave, tamanho, k in zip(indice.chaves, tamanhos, contagens):
+        # random.sample sobre range não materializa a lista de índices
+        sorteadas.extend((chave, j) for j in rng.sample(range(tamanho), k))
+    rng.shuffle(sorteadas)
+    return tuple(sorteadas)
@@ -0,0 +1,118 @@
+"""Testes da compilação do banco (compilar_banco.py) em diretórios temporários."""
+import json
+
+import pytest
+
+from banco_perguntas import BancoInvalidoError, carregar_banco
+from compilar_banco import compilar, id_questao
+
+KALECKI = """\
+## V
+Kalecki rejeita a Lei de Say.
+
+> Os gastos determinam os lucros.
+
+## F
+Para Kalecki, o preço é dado pela oferta e demanda.
+
+> O preço é dado pelo mark-up sobre os custos.
+"""
+
+TER = """\
+## F
+Nas expectativas racionais, os agentes erram sistematicamente.
+
+> Os erros não são sistemáticos.
+"""
+
+
+def _fontes(tmp_path, **textos):
+    fontes = tmp_path / "fontes"
+    fontes.mkdir(exist_ok=True)
+    definicoes = []
+    for chave, texto in textos.items():
+        (fontes / f"{chave}.md").write_text(texto, encoding="utf-8")
+        definicoes.append({"chave": chave, "menu": chave.title(), "titulo": chave.title(),
+                           "descricao": f"Questões de {chave}", "emoji": "📘", "fonte": f"{chave}.md"})
+    (fontes / "topicos.json").write_text(json.dumps(definicoes), encoding="utf-8")
+    return fontes
+
+
+def _indice(saida):
+    return json.loads((saida / "indice.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("texto, erro", [
+    ("## X\nEnunciado.\n\n> Justificativa.\n", r"kalecki\.md:1: resposta deve ser V ou F"),
+    ("## V\n\n> Justificativa.\n", r"kalecki\.md:1: enunciado vazio"),
+    ("## V\nEnunciado.\n", r"kalecki\.md:1: justificativa vazia"),
+    ("Texto solto.\n## V\nEnunciado.\n\n> Justificativa.\n", r"kalecki\.md:1: texto fora de uma questão"),
+    ("## V\nO   Enunciado.\n\n> A.\n\n## F\no enunciado.\n\n> B.\n",
+     r"kalecki\.md:6: questão repetida \(mesmo enunciado da linha 1\)"),
+    ("", r"kalecki\.md: nenhuma questão"),
+])
+def test_fonte_invalida_e_rejeitada_com_arquivo_e_linha(tmp_path, texto, erro):
+    fontes = _fontes(tmp_path, kalecki=texto)
+    with pytest.raises(BancoInvalidoError, match=erro):
+        compilar(str(fontes), str(tmp_path / "banco"))
+    assert not (tmp_path / "banco" / "indice.json").exists()
+
+
+def test_csv_sem_colunas_e_rejeitado(tmp_path):
+    fontes = _fontes(tmp_path, kalecki=KALECKI)
+    (fontes / "kalecki.csv").write_text("resposta,pergunta\nV,Enunciado\n", encoding="utf-8")
+    definicoes = json.loads((fontes / "topicos.json").read_text(encoding="utf-8"))
+    definicoes[0]["fonte"] = "kalecki.csv"
+    (fontes / "topicos.json").write_text(json.dumps(definicoes), encoding="utf-8")
+    with pytest.raises(BancoInvalidoError, match="colunas ausentes: justificativa"):
+        compilar(str(fontes), str(tmp_path / "banco"))
+
+
+def test_topico_sem_mudancas_e_reaproveitado(tmp_path):
+    fontes, saida = _fontes(tmp_path, kalecki=KALECKI, ter=TER), tmp_path / "banco"
+    primeira = compilar(str(fontes), str(saida))
+    assert primeira.reconstruidos == ("kalecki", "ter")
+
+    # Nada mudou: mesma versão e nenhum arquivo regravado
+    arquivos = {p.name: p.stat().st_mtime_ns for p in saida.iterdir()}
+    segunda = compilar(str(fontes), str(saida))
+    assert (segunda.versao, segunda.reconstruidos) == (primeira.versao, ())
+    assert {p.name: p.stat().st_mtime_ns for p in saida.iterdir()} == arquivos
+
+    # Só o tópico alterado é reconstruído; reordenar questões não muda os ids
+    ids = _indice(saida)["topicos"][0]["ids"]
+    blocos = KALECKI.split("\n\n## ")
+    _fontes(tmp_path, kalecki=f"## {blocos[1]}\n\n{blocos[0]}", ter=TER)
+    terceira = compilar(str(fontes), str(saida))
+    assert terceira.versao == primeira.versao + 1
+    assert (terceira.reconstruidos, terceira.reaproveitados) == (("kalecki",), ("ter",))
+    assert set(_indice(saida)["topicos"][0]["ids"]) == set(ids)
+
+
+def test_indice_traz_as_contagens_de_cada_topico(tmp_path):
+    fontes, saida = _fontes(tmp_path, kalecki=KALECKI, ter=TER), tmp_path / "banco"
+    compilar(str(fontes), str(saida))
+    banco = carregar_banco(str(saida))
+    for t in banco.topicos:
+        perguntas = banco.perguntas(t.chave)
+        justificativas = banco.justificativas(t.chave)
+        assert t.contagem.verdadeiras == sum(q.resposta_correta == "V" for q in perguntas)
+        assert t.contagem.falsas == sum(q.resposta_correta == "F" for q in perguntas)
+        assert t.contagem.caracteres_pergunta == sum(len(q.pergunta) for q in perguntas)
+        assert t.contagem.caracteres_justificativa == sum(map(len, justificativas.values()))
+
+
+def test_aliases_mantidos_descartados_e_rejeitados(tmp_path):
+    fontes, saida = _fontes(tmp_path, kalecki=KALECKI, ter=TER), tmp_path / "banco"
+    atual = id_questao("kalecki", "Kalecki rejeita a Lei de Say.")
+    aliases = {"kalecki-01": atual, "ter-01": "ter-0000000000"}
+    (fontes / "aliases.json").write_text(json.dumps(aliases), encoding="utf-8")
+    compilar(str(fontes), str(saida))
+    assert _indice(saida)["aliases"] == {"kalecki-01": atual}
+    assert carregar_banco(str(saida)).resolver("kalecki-01") == atual
+
+    # Um alias não pode ser o id de uma questão que ainda está no banco
+    aliases[atual] = id_questao("ter", "Nas expectativas racionais, os agentes erram sistematicamente.")
+    (fontes / "aliases.json").write_text(json.dumps(aliases), encoding="utf-8")
+    with pytest.raises(BancoInvalidoError, match="é o id de uma questão atual"):
+        compilar(str(fontes), str(saida))
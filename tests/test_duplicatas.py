@@ -0,0 +1,64 @@
+"""Testes da detecção de quase duplicatas (duplicatas.py) contra a comparação de todos os pares."""
+import itertools
+import random
+
+from banco_perguntas import carregar_banco
+from duplicatas import LIMIAR, assinaturas, duplicatas_do_banco, encontrar_duplicatas, shingles
+
+
+def _forca_bruta(itens, limiar=LIMIAR):
+    pares = set()
+    conjuntos = [(id_pergunta, shingles(texto)) for id_pergunta, texto in itens]
+    for (id_a, a), (id_b, b) in itertools.combinations(conjuntos, 2):
+        similaridade = len(a & b) / len(a | b)
+        if similaridade >= limiar:
+            pares.add((round(similaridade, 3), *sorted((id_a, id_b))))
+    return pares
+
+
+def test_banco_tem_os_mesmos_pares_da_forca_bruta():
+    banco = carregar_banco()
+    itens = [(q.id, q.pergunta) for t in banco.topicos for q in banco.perguntas(t.chave)]
+    assert set(duplicatas_do_banco(banco)) == _forca_bruta(itens)
+
+
+def _itens_sinteticos(n=400, semente=5):
+    """Enunciados aleatórios, parte deles cópias com algumas palavras trocadas."""
+    rng = random.Random(semente)
+    vocabulario = [f"termo{i:03d}" for i in range(600)]
+    itens = []
+    for i in range(n):
+        if itens and rng.random() < 0.3:
+            palavras = rng.choice(itens)[1].split()
+            for _ in range(rng.randrange(3)):
+                palavras[rng.randrange(len(palavras))] = rng.choice(vocabulario)
+        else:
+            palavras = rng.sample(vocabulario, 12)
+        itens.append((f"q{i}", " ".join(palavras)))
+    return itens
+
+
+def test_pares_confirmados_pelo_jaccard_exato_e_ordenados():
+    itens = _itens_sinteticos()
+    esperado = _forca_bruta(itens)
+    pares = encontrar_duplicatas(itens)
+    assert set(pares) <= esperado
+    assert pares == sorted(pares, key=lambda p: (-p.similaridade, p.id_a, p.id_b))
+    # O LSH pode perder um par perto do limiar, mas não os bem parecidos
+    parecidos = {p for p in esperado if p[0] >= 0.6}
+    assert len(parecidos) > 50
+    assert parecidos <= set(pares)
+
+
+def test_assinaturas_estimam_o_jaccard():
+    itens = _itens_sinteticos(60)
+    conjuntos = [shingles(texto) for _, texto in itens]
+    matriz = assinaturas(conjuntos, permutacoes=512)
+    for i, j in itertools.combinations(range(len(conjuntos)), 2):
+        jaccard = len(conjuntos[i] & conjuntos[j]) / len(conjuntos[i] | conjuntos[j])
+        assert abs((matriz[i] == matriz[j]).mean() - jaccard) < 0.15
+
+
+def test_shingles_ignoram_acentos_plural_e_stopwords():
+    assert shingles("As expectativas da informação") == shingles("expectativa informações")
+    assert encontrar_duplicatas([("a", "texto único")]) == []
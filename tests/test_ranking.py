@@ -0,0 +1,83 @@
+"""Testes do ranking da turma (ranking.py) contra uma lista ordenada de referência."""
+import bisect
+import random
+
+import pytest
+
+from banco_perguntas import Pergunta
+from placar import Placar
+from ranking import Classificacao, ListaIndexavel
+
+
+def test_lista_indexavel_igual_a_lista_ordenada():
+    rng = random.Random(7)
+    lista, esperado = ListaIndexavel(semente=1), []
+    for _ in range(2000):
+        chave = rng.randrange(300)
+        if chave in esperado:
+            lista.remover(chave)
+            esperado.remove(chave)
+        else:
+            lista.inserir(chave)
+            bisect.insort(esperado, chave)
+
+    assert len(lista) == len(esperado)
+    assert list(lista) == esperado
+    assert [lista[i] for i in range(len(lista))] == esperado
+    assert [lista.posicao(chave) for chave in esperado] == list(range(len(esperado)))
+
+
+def test_lista_indexavel_chave_ou_posicao_ausente():
+    lista = ListaIndexavel(semente=1)
+    lista.inserir(1)
+    with pytest.raises(KeyError):
+        lista.remover(2)
+    with pytest.raises(KeyError):
+        lista.posicao(2)
+    with pytest.raises(IndexError):
+        lista[1]
+
+
+def _esperado(pontuacoes, k=10):
+    """Top-k de referência: mais acertos primeiro e, no empate, quem chegou antes à pontuação."""
+    ordem = sorted(pontuacoes.items(), key=lambda item: (-item[1][0], item[1][1], item[0]))
+    return [(i, sessao, acertos) for i, (sessao, (acertos, _)) in enumerate(ordem[:k], 1)]
+
+
+def test_300_atualizacoes_aleatorias_dao_o_mesmo_top10():
+    rng = random.Random(3)
+    classificacao = Classificacao(intervalo=0)
+    geral, por_topico = {}, {}  # sessão -> (acertos, instante em que chegou a eles)
+    for instante in range(300):
+        sessao = f"s{rng.randrange(40)}"
+        topico = rng.choice(("kalecki", "ter"))
+        acertos_topico, acertos_total = rng.randrange(8), rng.randrange(20)
+        classificacao.registrar(sessao, sessao.upper(), topico, acertos_topico, acertos_total, instante)
+        for pontuacoes, acertos in ((geral, acertos_total), (por_topico.setdefault(topico, {}), acertos_topico)):
+            # Mesma pontuação: o aluno mantém o lugar de quando chegou a ela
+            if pontuacoes.get(sessao, (None,))[0] != acertos:
+                pontuacoes[sessao] = (acertos, instante)
+
+    for chave_topico, pontuacoes in [(Classificacao.GERAL, geral), *por_topico.items()]:
+        quadro = classificacao.quadro(chave_topico)
+        assert [(c.posicao, c.sessao, c.acertos) for c in quadro.primeiros] == _esperado(pontuacoes)
+        assert all(c.nome == c.sessao.upper() for c in quadro.primeiros)
+        assert quadro.participantes == len(pontuacoes)
+        posicoes = {sessao: i for i, sessao, _ in _esperado(pontuacoes, k=len(pontuacoes))}
+        for sessao, posicao in posicoes.items():
+            assert classificacao.posicao(sessao, chave_topico) == (posicao, len(pontuacoes))
+
+
+def test_ranking_conta_so_a_primeira_tentativa():
+    q = Pergunta("kalecki-1", "Enunciado", "V")
+    placar = Placar()
+    placar.registrar("kalecki", q, "F")
+    placar.registrar("kalecki", q, "V")
+    assert placar.contagem("kalecki") == (1, 1)
+    assert placar.acertos_de_primeira("kalecki") == placar.acertos_de_primeira() == 0
+
+    # Restaurado do backend: a primeira resposta vem do estado "primeiras" da sessão
+    restaurado = Placar.a_partir_de(placar.respostas, {"kalecki-1": "F"})
+    assert restaurado.contagem("kalecki") == (1, 1)
+    assert restaurado.acertos_de_primeira() == 0
+    assert Placar.a_partir_de(placar.respostas).acertos_de_primeira() == 1